@@ -0,0 +1,108 @@
+import os
+import tempfile
+
+# tickets.database reads the url at import, so this runs before anything imports tickets
+_DB_DIR = tempfile.mkdtemp(prefix="tickets-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'tickets.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ.setdefault("JWT_TOKEN", "test-secret")
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tickets import models
+from tickets.database import Base, SessionLocal, async_engine, engine
+from tickets.enums import ProjectRole, TeamRole, WorkerRole
+from tickets.jwttoken import create_access_token
+from tickets.oauth2 import principal_cache
+from tickets.repository.name_index import name_index
+from tickets.repository.ticket_search import inverted_index
+from tickets.repository.workload import workload_index
+
+
+@pytest.fixture(autouse=True)
+def fresh_db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    for cache in (principal_cache, name_index, inverted_index, workload_index):
+        cache.clear()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def seed(db):
+    """
+    One team with a project and its worker team.
+    alice: team and project admin; bob and carol: project members; dave: team only.
+    """
+    users = {
+        name: models.User(name=name, email=f"{name}@example.com", password="x")
+        for name in ("alice", "bob", "carol", "dave")
+    }
+    db.add_all(users.values())
+    db.flush()
+    team = models.Team(name="Core", code="CORE01")
+    db.add(team)
+    db.flush()
+    db.add_all([
+        models.UserTeam(user_id=users["alice"].id, team_id=team.id, role=TeamRole.admin),
+        *(models.UserTeam(user_id=users[n].id, team_id=team.id) for n in ("bob", "carol", "dave")),
+    ])
+    worker_team = models.WorkerTeam(team_id=team.id, name="Support", admin_id=users["alice"].id)
+    db.add(worker_team)
+    db.flush()
+    db.add(models.WorkerTeamMember(user_id=users["alice"].id, worker_team_id=worker_team.id, role=WorkerRole.admin))
+    project = models.Project(name="Backend", team_id=team.id, created_by=users["alice"].id, worker_team_id=worker_team.id)
+    db.add(project)
+    db.flush()
+    db.add_all([
+        models.ProjectUser(user_id=users["alice"].id, project_id=project.id, role=ProjectRole.admin),
+        models.ProjectUser(user_id=users["bob"].id, project_id=project.id),
+        models.ProjectUser(user_id=users["carol"].id, project_id=project.id),
+    ])
+    db.commit()
+    return SimpleNamespace(
+        team_id=team.id,
+        project_id=project.id,
+        worker_team_id=worker_team.id,
+        **{name: user.id for name, user in users.items()},
+    )
+
+
+# slow measurements that print numbers, opt in with RUN_BENCHMARKS=1
+benchmark = pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run benchmarks")
+
+
+def auth_headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+@pytest.fixture
+def client():
+    from tickets.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+        # aiosqlite connections belong to this client's event loop
+        test_client.portal.call(async_engine.dispose)
+
+
+def post_ticket(client, project_id: int, user_id: int, **fields) -> dict:
+    body = {"title": "Ticket", "description": "text", "type": "user", "assigned_to_name": "bob", **fields}
+    response = client.post(f"/projects/{project_id}/tickets", json=body, headers=auth_headers(user_id))
+    assert response.status_code == 201, response.text
+    return response.json()
@@ -0,0 +1,196 @@
+"""
+Team status summary and workload are GROUP BYs in the db. They must match what
+the previous pandas implementation computed from a frame of every ticket.
+"""
+import asyncio
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import insert
+
+import httpx
+
+from tickets import models
+from tickets.database import async_engine
+from tickets.enums import TicketPriority, TicketStatus, TicketType
+from tickets.main import app
+from tickets.routers import analytics
+
+from conftest import benchmark
+
+pd = pytest.importorskip("pandas")
+
+DANGLING_USER_ID = 999
+# team sizes to measure, e.g. BENCH_TEAM_TICKETS=10000,100000,1000000
+BENCH_TEAM_TICKETS = [int(n) for n in os.getenv("BENCH_TEAM_TICKETS", "10000,100000").split(",")]
+
+
+def pandas_team_metrics(team_id: int, df) -> Dict[str, Any]:
+    """The frame-based version, as it was before the GROUP BYs."""
+    if df.empty:
+        return {"team_id": team_id, "total_tickets": 0, "status_summary": {}, "workload": []}
+    total_tickets = len(df)
+    workload_df = df.groupby(["assignee_id", "assignee_name"]).size().reset_index(name="count")
+    workload_df["percent"] = (workload_df["count"] / total_tickets * 100).round(0).astype(int)
+    return {
+        "team_id": team_id,
+        "total_tickets": total_tickets,
+        # the frame holds TicketStatus members, the response their values
+        "status_summary": {s.value: n for s, n in df["status"].value_counts().sort_index().items()},
+        "workload": [
+            {
+                "assignee_id": int(row.assignee_id) if pd.notna(row.assignee_id) else None,
+                "assignee_name": row.assignee_name or "Unassigned",
+                "count": int(row.count),
+                "percent": int(row.percent),
+            }
+            for row in workload_df.itertuples(index=False)
+        ],
+    }
+
+
+@pytest.fixture
+def team_tickets(db, seed):
+    """
+    200 tickets, so 1, 3 and 5 tickets are 0.5%, 1.5% and 2.5% and the rounding
+    shows; one assignee no longer exists. Another team's tickets must not count.
+    """
+    rng = random.Random(24)
+    other = models.Team(name="Other", code="OTHER1")
+    db.add(other)
+    db.flush()
+    assignees = [seed.bob] + [seed.carol] * 3 + [seed.alice] * 5 + [DANGLING_USER_ID] + [seed.dave] * 190
+    start = datetime(2025, 5, 1)
+
+    def row(team_id, assignee, n):
+        created = start + timedelta(hours=n)
+        return {
+            "title": f"T{n}", "description": "text", "type": TicketType.user,
+            "status": rng.choice(list(TicketStatus)), "priority": rng.choice(list(TicketPriority)),
+            "confirmed": False, "created_by": seed.alice, "assigned_to": assignee,
+            "team_id": team_id, "project_id": seed.project_id,
+            "created_at": created, "updated_at": created, "version": 1,
+        }
+
+    rows = [row(seed.team_id, a, n) for n, a in enumerate(assignees)]
+    rows += [row(other.id, seed.bob, n) for n in range(30)]
+    db.execute(insert(models.Ticket), rows)
+    db.commit()
+    return seed
+
+
+def test_group_by_matches_pandas(db, team_tickets):
+    expected = pandas_team_metrics(team_tickets.team_id, analytics._query_tickets(team_tickets.team_id, db))
+
+    assert analytics.compute_team_metrics(team_tickets.team_id, db) == expected
+    assert expected["total_tickets"] == 200
+    assert DANGLING_USER_ID not in {w["assignee_id"] for w in expected["workload"]}
+    assert {w["assignee_id"]: w["percent"] for w in expected["workload"]} == {
+        team_tickets.alice: 2, team_tickets.bob: 0, team_tickets.carol: 2, team_tickets.dave: 95,
+    }
+
+
+def test_route_matches_pandas(client, db, team_tickets):
+    expected = pandas_team_metrics(team_tickets.team_id, analytics._query_tickets(team_tickets.team_id, db))
+
+    response = client.get(f"/analytics/teams/{team_tickets.team_id}/metrics")
+
+    assert response.status_code == 200, response.text
+    assert response.json() == expected
+
+
+def test_empty_team_matches_pandas(db, seed):
+    expected = pandas_team_metrics(seed.team_id, analytics._query_tickets(seed.team_id, db))
+    assert analytics.compute_team_metrics(seed.team_id, db) == expected
+
+
+def test_frame_work_stays_off_the_event_loop(seed, monkeypatch):
+    def slow_sla(team_id, df):
+        time.sleep(0.5)  # stands in for pandas on a large team
+        return {"team_id": team_id, "sla_compliance": {}}
+
+    monkeypatch.setattr(analytics, "_sla_metrics", slow_sla)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            sla = asyncio.create_task(http.get(f"/analytics/teams/{seed.team_id}/sla-metrics"))
+            # the longest the loop went without running another task
+            stall, last = 0.0, time.perf_counter()
+            while not sla.done():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                stall, last = max(stall, now - last), now
+            response = await sla
+        await async_engine.dispose()
+        return stall, response
+
+    stall, response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert stall < 0.3, f"the event loop stalled {stall:.2f}s on the analytics computation"
+
+
+def _seed_team(db, seed, n: int) -> None:
+    rng = random.Random(n)
+    users = [seed.alice, seed.bob, seed.carol, seed.dave]
+    start = datetime(2024, 1, 1)
+    for offset in range(0, n, 10_000):
+        db.execute(insert(models.Ticket), [
+            {
+                "title": "T", "description": "text", "type": TicketType.user,
+                "status": rng.choice(list(TicketStatus)), "priority": rng.choice(list(TicketPriority)),
+                "confirmed": False, "created_by": seed.alice, "assigned_to": rng.choice(users),
+                "team_id": seed.team_id, "project_id": seed.project_id,
+                "created_at": start + timedelta(minutes=i), "version": 1,
+            }
+            for i in range(offset, min(n, offset + 10_000))
+        ])
+    db.commit()
+
+
+def _measure(run) -> tuple[float, int]:
+    """(best of 3 seconds, peak bytes allocated during one more run)."""
+    seconds = min(_timed(run) for _ in range(3))
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def _timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+@benchmark
+@pytest.mark.parametrize("n", BENCH_TEAM_TICKETS)
+def test_team_metrics_memory_and_latency(db, seed, n):
+    _seed_team(db, seed, n)
+    team_id = seed.team_id
+
+    def frame():
+        db.expunge_all()
+        return pandas_team_metrics(team_id, analytics._query_tickets(team_id, db))
+
+    def group_by():
+        db.expunge_all()
+        return analytics.compute_team_metrics(team_id, db)
+
+    assert group_by() == frame()
+    frame_s, frame_peak = _measure(frame)
+    group_s, group_peak = _measure(group_by)
+    mb = 1024 * 1024
+    print(
+        f"\nteam metrics, {n:,} tickets: "
+        f"frame + value_counts {frame_s * 1000:.0f}ms peak {frame_peak / mb:.1f}MB, "
+        f"GROUP BY {group_s * 1000:.0f}ms peak {group_peak / mb:.2f}MB"
+    )
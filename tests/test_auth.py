@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from tickets import models
+from tickets.hashing import HASH_RETRY_AFTER_SECONDS, HashExecutor, HashingBusy, hash_executor, pwd_cxt
+
+
+def login(client, username, password):
+    return client.post("/auth/", json={"username": username, "password": password})
+
+
+def test_first_login_registers_then_verifies(client):
+    first = login(client, "erin", "s3cret")
+    assert first.status_code == 200
+    assert first.json()["name"] == "erin"
+    assert "access_token" in first.cookies
+
+    again = login(client, "erin", "s3cret")
+    assert again.status_code == 200
+    assert again.json()["id"] == first.json()["id"]
+
+    assert login(client, "erin", "wrong").status_code == 401
+
+
+def test_login_returns_memberships(client, db, seed):
+    # seeded users have no usable hash, give alice one
+    db.get(models.User, seed.alice).password = pwd_cxt.hash("pw")
+    db.commit()
+
+    response = login(client, "alice", "pw")
+    assert response.status_code == 200
+    (team,) = response.json()["teams"]
+    assert team["team"]["id"] == seed.team_id
+    assert [p["project"]["id"] for p in team["projects"]] == [seed.project_id]
+
+
+def test_login_rehashes_other_rounds(client, db):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("pw")
+    user = models.User(name="frank", email="frank@local", password=old_hash)
+    db.add(user)
+    db.commit()
+
+    assert login(client, "frank", "pw").status_code == 200
+    db.expire_all()
+    new_hash = db.get(models.User, user.id).password
+    assert new_hash != old_hash
+    assert pwd_cxt.verify("pw", new_hash) and not pwd_cxt.needs_update(new_hash)
+
+
+def test_login_answers_503_when_hashing_is_saturated(client, monkeypatch):
+    full = threading.BoundedSemaphore(1)
+    full.acquire()
+    monkeypatch.setattr(hash_executor, "_slots", full)
+
+    response = login(client, "gina", "pw")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(HASH_RETRY_AFTER_SECONDS)
+
+
+def test_executor_raises_domain_error_not_http():
+    executor = HashExecutor(workers=1, queue_limit=0)
+    gate = threading.Event()
+
+    async def scenario():
+        held = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HashingBusy) as exc:
+            await executor.run(pwd_cxt.hash, "pw")
+        gate.set()
+        await held
+        return exc.value
+
+    busy = asyncio.run(scenario())
+    assert busy.retry_after == HASH_RETRY_AFTER_SECONDS
+    assert executor.stats()["rejected"] == 1
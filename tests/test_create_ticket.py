@@ -0,0 +1,129 @@
+import os
+import re
+import statistics
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from tickets import models
+from tickets.database import engine
+from tickets.enums import TicketEventKind, TicketStatus
+from tickets.models import ProjectUser
+from tickets.repository import ticket as ticket_repo
+from tickets.repository.name_index import name_index
+from tickets.repository.ticket_counts import record_transitions
+from tickets.repository.ticket_event import record_event
+from tickets.schemas.ticket import TicketCreate
+
+from conftest import benchmark
+
+BENCH_CREATES = int(os.getenv("BENCH_CREATES", "300"))
+# added to every statement, stands in for the network between app and database
+BENCH_RTT_MS = float(os.getenv("BENCH_RTT_MS", "0.5"))
+
+
+@contextmanager
+def statements():
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # "SELECT ... FROM projects", "INSERT INTO tickets", ...
+        verb = statement.split(None, 1)[0].upper()
+        table = re.search(r"\b(?:FROM|INTO)\s+(\w+)", statement, re.IGNORECASE).group(1)
+        seen.append(f"{verb} {table}")
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _create(db, seed, **fields):
+    payload = TicketCreate(title="Printer jam", description="Tray 2", type="user", **fields)
+    return ticket_repo.create_ticket(db, payload, seed.alice, seed.project_id)
+
+
+def test_create_is_one_select_then_the_writes(db, seed):
+    name_index.get(db, seed.project_id)  # warm, as on a busy worker
+    with statements() as seen:
+        _create(db, seed, assigned_to_name="bob")
+    assert seen == [
+        "SELECT projects",                # project, membership and worker team together
+        "INSERT tickets",                 # RETURNING id, no refresh
+        "INSERT ticket_events",
+        "INSERT project_ticket_counts",
+        "INSERT user_ticket_counts",
+    ]
+
+
+def test_cold_name_index_adds_one_select(db, seed):
+    with statements() as seen:
+        _create(db, seed, assigned_to_name="bob")
+    assert seen.count("SELECT users") == 1
+    assert len(seen) == 6
+
+
+def test_returned_ticket_matches_a_reload(db, seed):
+    created = _create(db, seed, assigned_to_name="bob")
+    assert created == ticket_repo.get_ticket_by_id(db, created.id, seed.project_id)
+
+
+def _create_before(db, seed):
+    """create_ticket as it was before the single-SELECT rewrite, same writes at the end."""
+    db.get(models.Team, seed.team_id)
+    project = db.get(models.Project, seed.project_id)
+    db.query(ProjectUser).filter_by(user_id=seed.alice, project_id=seed.project_id).first()
+    assignee = (
+        db.query(models.User)
+          .join(ProjectUser, ProjectUser.user_id == models.User.id)
+          .filter(ProjectUser.project_id == seed.project_id, models.User.name == "bob")
+          .first()
+    )
+    ticket = models.Ticket(
+        title="Printer jam", description="Tray 2", type="user", created_by=seed.alice,
+        assigned_to=assignee.id, team_id=project.team_id, project_id=seed.project_id,
+    )
+    db.add(ticket)
+    db.flush()
+    record_event(db, TicketEventKind.created, ticket.id, seed.project_id, project.team_id, seed.alice)
+    record_transitions(db, [(seed.project_id, None, (TicketStatus.open, assignee.id))])
+    db.commit()
+    db.refresh(ticket)
+    return ticket_repo._load_ticket(db, ticket.id)
+
+
+def _latencies(db, create) -> list[float]:
+    samples = []
+    for _ in range(BENCH_CREATES):
+        start = time.perf_counter()
+        create()
+        samples.append((time.perf_counter() - start) * 1000)
+        db.expunge_all()
+    return samples
+
+
+def _p(samples: list[float], q: int) -> float:
+    return statistics.quantiles(samples, n=100)[q - 1]
+
+
+@benchmark
+def test_create_latency_before_and_after(db, seed):
+    name_index.get(db, seed.project_id)
+
+    def network(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(BENCH_RTT_MS / 1000)
+
+    event.listen(engine, "before_cursor_execute", network)
+    try:
+        before = _latencies(db, lambda: _create_before(db, seed))
+        after = _latencies(db, lambda: _create(db, seed, assigned_to_name="bob"))
+    finally:
+        event.remove(engine, "before_cursor_execute", network)
+    print(
+        f"\ncreate_ticket x{BENCH_CREATES}, {BENCH_RTT_MS}ms per statement: "
+        f"before p50 {_p(before, 50):.2f}ms p99 {_p(before, 99):.2f}ms, "
+        f"after p50 {_p(after, 50):.2f}ms p99 {_p(after, 99):.2f}ms"
+    )
+    assert _p(after, 50) < _p(before, 50)
@@ -0,0 +1,24 @@
+import pytest
+from tickets import main
+
+
+def test_metrics_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(main, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}, {"Authorization": "scrape-secret"}])
+def test_metrics_rejects_missing_or_wrong_token(client, monkeypatch, headers):
+    monkeypatch.setattr(main, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics", headers=headers).status_code == 401
+
+
+def test_metrics_with_token(client, monkeypatch):
+    monkeypatch.setattr(main, "METRICS_TOKEN", "scrape-secret")
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert {"principal_cache", "password_hashing", "db_pools", "realtime", "workload_index"} <= set(response.json())
+
+
+def test_metrics_not_in_openapi(client):
+    assert "/metrics" not in client.get("/openapi.json").json()["paths"]
@@ -0,0 +1,85 @@
+from tickets import models
+from tickets.repository.name_index import EXACT, FUZZY, PREFIX, ProjectNameIndex
+
+from conftest import auth_headers
+
+
+def _create(client, seed, name):
+    return client.post(
+        f"/projects/{seed.project_id}/tickets",
+        json={"title": "t", "description": "d", "type": "user", "assigned_to_name": name},
+        headers=auth_headers(seed.alice),
+    )
+
+
+def _join(db, seed, name) -> int:
+    user = models.User(name=name, password="x")
+    db.add(user)
+    db.flush()
+    db.add(models.ProjectUser(user_id=user.id, project_id=seed.project_id))
+    db.commit()
+    return user.id
+
+
+def test_lookup_tiers():
+    index = ProjectNameIndex([(1, "Alice"), (2, "Bob"), (3, "Bobby Tables")])
+    assert [(m.user_id, m.tier) for m in index.lookup("bob")] == [(2, EXACT), (3, PREFIX)]
+    assert [(m.user_id, m.tier) for m in index.lookup("rob")] == [(2, FUZZY)]
+
+
+def test_exact_name_is_assigned(client, seed):
+    response = _create(client, seed, "  BOB ")
+    assert response.status_code == 201
+    assert response.json()["assignee"] == {"id": seed.bob, "name": "bob"}
+
+
+def test_exact_match_wins_over_prefix(client, db, seed):
+    _join(db, seed, "bobby")
+    assert _create(client, seed, "bob").json()["assignee"]["id"] == seed.bob
+
+
+def test_unique_prefix_is_assigned(client, seed):
+    assert _create(client, seed, "car").json()["assignee"]["id"] == seed.carol
+
+
+def test_typo_match_is_not_assigned(client, seed):
+    # "rob" is one edit away from "bob"; it used to be assigned to bob
+    response = _create(client, seed, "rob")
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"Assignee 'rob' not found in this project, closest: bob (id {seed.bob})"
+
+
+def test_unknown_name_without_candidates(client, seed):
+    response = _create(client, seed, "zed")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Assignee 'zed' not found in this project"
+
+
+def test_shared_prefix_is_ambiguous(client, db, seed):
+    bobby = _join(db, seed, "bobby")
+    response = _create(client, seed, "bo")
+    assert response.status_code == 409
+    assert response.json()["detail"] == (
+        f"Assignee 'bo' matches several project members: bob (id {seed.bob}), bobby (id {bobby})"
+    )
+
+
+def test_duplicate_exact_names_are_ambiguous(client, db, seed):
+    other = _join(db, seed, "Bob")
+    response = _create(client, seed, "bob")
+    assert response.status_code == 409
+    assert f"(id {seed.bob})" in response.json()["detail"] and f"(id {other})" in response.json()["detail"]
+
+
+def test_batch_create_reports_unresolved_name_per_item(client, seed):
+    response = client.post(
+        f"/projects/{seed.project_id}/tickets:batch",
+        json={"operations": [
+            {"op": "create", "title": "t", "description": "d", "type": "user", "assigned_to_name": "rob"},
+            {"op": "create", "title": "t", "description": "d", "type": "user", "assigned_to_name": "bob"},
+        ]},
+        headers=auth_headers(seed.alice),
+    )
+    first, second = response.json()
+    assert (first["ok"], first["status_code"]) == (False, 404)
+    assert (second["ok"], second["status_code"]) == (True, 201)
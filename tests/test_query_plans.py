@@ -0,0 +1,150 @@
+"""
+Runs each hot repository query on a seeded SQLite database and checks its
+EXPLAIN QUERY PLAN: the table is searched through an index, never scanned.
+"""
+import random
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+from tickets import models
+from tickets.auth_context import load_auth_context
+from tickets.database import engine
+from tickets.enums import TicketPriority, TicketStatus, TicketType
+from tickets.repository import ai_memory
+from tickets.repository import ticket as ticket_repo
+from tickets.repository.ticket_event import events_after, project_watermark, sync_position
+from tickets.repository.workload import workload_index
+from tickets.routers import analytics
+from tickets.schemas.ticket import TicketFilter
+
+TICKETS_PER_PROJECT = 800
+
+
+@pytest.fixture
+def big(db, seed):
+    """
+    The seed plus other teams' projects, a few thousand tickets, events and chat
+    messages. Several teams, so a team filter is as selective as in production.
+    """
+    rng = random.Random(11)
+    projects = {seed.project_id: seed.team_id}
+    for name in ("Frontend", "Infra", "Mobile", "Data"):
+        team = models.Team(name=name, code=name.upper()[:6])
+        db.add(team)
+        db.flush()
+        project = models.Project(name=name, team_id=team.id, created_by=seed.alice)
+        db.add(project)
+        db.flush()
+        projects[project.id] = team.id
+    users = [seed.alice, seed.bob, seed.carol, seed.dave]
+    start = datetime(2025, 1, 1)
+    rows = []
+    for project_id, team_id in projects.items():
+        for n in range(TICKETS_PER_PROJECT):
+            created = start + timedelta(minutes=7 * n + project_id)
+            rows.append({
+                "title": f"ticket {n}", "description": "text",
+                "status": rng.choice(list(TicketStatus)), "priority": rng.choice(list(TicketPriority)),
+                "type": TicketType.user, "confirmed": False,
+                "created_by": rng.choice(users), "assigned_to": rng.choice(users),
+                "team_id": team_id, "project_id": project_id,
+                "created_at": created, "updated_at": created, "version": 1,
+            })
+    db.execute(insert(models.Ticket), rows)
+    db.execute(insert(models.TicketEvent), [
+        {"ticket_id": i + 1, "project_id": r["project_id"], "team_id": r["team_id"], "kind": 1}
+        for i, r in enumerate(rows)
+    ])
+    for user_id in users:
+        for k in range(3):
+            chat = models.SessionRecord(id=f"s{user_id}-{k}", user_id=user_id, created_at=start + timedelta(days=k))
+            db.add(chat)
+            db.add_all(models.ChatMessage(session_id=chat.id, role="user", content="hi") for _ in range(20))
+    db.commit()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return seed
+
+
+@contextmanager
+def plans():
+    """EXPLAIN QUERY PLAN details of every SELECT sent inside the block."""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    details: list[str] = []
+    try:
+        yield details
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            details.extend(row[-1] for row in rows)
+
+
+def assert_indexed(details: list[str], table: str) -> None:
+    assert details, "no query ran"
+    assert not [d for d in details if re.match(rf"SCAN {table}\b", d)], "\n".join(details)
+    assert any(re.match(rf"SEARCH {table} USING (COVERING )?INDEX", d) for d in details), "\n".join(details)
+
+
+def _list(db, seed, **filters):
+    page, cursor = ticket_repo.get_tickets_page(db, seed.project_id, TicketFilter(**filters), limit=20)
+    ticket_repo.get_tickets_page(db, seed.project_id, TicketFilter(**filters), cursor, limit=20)
+
+
+TICKET_QUERIES = {
+    "list page": lambda db, seed: _list(db, seed),
+    "list by status": lambda db, seed: _list(db, seed, status=TicketStatus.in_progress),
+    "list by assignee": lambda db, seed: _list(db, seed, assigned_to=seed.bob),
+    "assigned to me": lambda db, seed: ticket_repo.get_tickets_assigned_to_user(
+        db, load_auth_context(db, seed.bob), seed.project_id
+    ),
+    "created by me": lambda db, seed: ticket_repo.get_user_tickets(db, seed.carol, seed.project_id),
+    "team status summary": lambda db, seed: db.execute(analytics._status_counts_statement(seed.team_id)).all(),
+    "team workload": lambda db, seed: db.execute(analytics._workload_statement(seed.team_id)).all(),
+    "team tickets": lambda db, seed: db.execute(analytics._tickets_statement(seed.team_id)).all(),
+    "workload index load": lambda db, seed: workload_index.load(db, seed.team_id),
+}
+
+
+@pytest.mark.parametrize("query", TICKET_QUERIES.values(), ids=TICKET_QUERIES.keys())
+def test_ticket_queries_use_an_index(db, big, query):
+    db.expire_all()
+    with plans() as details:
+        query(db, big)
+    assert_indexed([d for d in details if "tickets" in d or "TICKETS" in d], "tickets")
+
+
+def test_project_watermark_uses_an_index(db, big):
+    with plans() as details:
+        project_watermark(db, big.project_id)
+    assert_indexed(details, "ticket_events")
+
+
+def test_delta_sync_reads_use_an_index(db, big):
+    with plans() as details:
+        events_after(db, big.project_id, sync_position(db, big.project_id), 100)
+        events_after(db, big.project_id, (0, 0), 100)
+    assert_indexed(details, "ticket_events")
+
+
+def test_chat_history_uses_an_index(db, big):
+    with plans() as details:
+        ai_memory.get_history(db, f"s{big.bob}-1")
+    assert_indexed(details, "chat_messages")
+
+
+def test_latest_chat_session_uses_an_index(db, big):
+    with plans() as details:
+        ai_memory.get_or_create_session(db, big.bob)
+    assert_indexed(details, "sessions")
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import sqlite3
+import time
+
+import anyio
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from tickets import models
+from tickets.auth_context import AuthContext
+from tickets.database import DATABASE_URL, async_engine, get_db
+from tickets.enums import TicketType
+from tickets.main import app
+from tickets.repository import ticket as ticket_repo
+from tickets.routers.dependencies import get_auth_context
+from tickets.schemas.ticket import TicketFilter
+from tickets.serialization import json_response
+
+from conftest import auth_headers, benchmark, post_ticket
+
+BENCH_CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "32"))
+BENCH_REQUESTS = int(os.getenv("BENCH_REQUESTS", "1000"))
+
+
+READ_ROUTES = [
+    "/projects/{project_id}/tickets",
+    "/projects/{project_id}/tickets/my-assigned",
+    "/projects/{project_id}/tickets/my-created",
+    "/projects/{project_id}/tickets/search?q=printer",
+    "/projects/{project_id}/tickets/counts",
+    "/projects/{project_id}/tickets/changes",
+    "/projects/{project_id}/tickets/{ticket_id}",
+    "/teams/{team_id}/projects/",
+    "/teams/{team_id}/projects/{project_id}",
+    "/teams/{team_id}/projects/{project_id}/members",
+    "/teams/{team_id}/users",
+    "/teams/{team_id}/available-admins",
+    "/teams/{team_id}/available-users",
+    "/teams/{team_id}/users/{bob}",
+    "/teams/{team_id}/teams",
+]
+
+
+@pytest.fixture
+def urls(client, seed):
+    ticket = post_ticket(client, seed.project_id, seed.alice, title="Printer jam")
+    return [route.format(ticket_id=ticket["id"], **vars(seed)) for route in READ_ROUTES]
+
+
+def test_read_routes_serve_members(client, seed, urls):
+    for url in urls:
+        response = client.get(url, headers=auth_headers(seed.alice))
+        assert response.status_code == 200, (url, response.text)
+
+
+def test_read_routes_require_a_token(client, urls):
+    for url in urls:
+        assert client.get(url).status_code == 401, url
+
+
+def test_read_routes_check_membership(client, seed):
+    outsider = auth_headers(seed.dave)  # in the team, not in the project
+    assert client.get(f"/projects/{seed.project_id}/tickets/counts", headers=outsider).status_code == 403
+    assert client.get(f"/teams/{seed.team_id + 1}/projects/", headers=outsider).status_code == 403
+
+
+def test_waiting_reads_hold_no_request_threads(client, seed):
+    """
+    With a single threadpool token, reads stuck behind a write lock must not
+    stop a sync route from being served: they wait on the event loop, not in a thread.
+    """
+    post_ticket(client, seed.project_id, seed.alice)
+    headers = auth_headers(seed.alice)
+    path = make_url(DATABASE_URL).database
+
+    async def scenario():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            writer = sqlite3.connect(path)
+            writer.execute("BEGIN EXCLUSIVE")
+            try:
+                reads = [
+                    asyncio.create_task(http.get(f"/projects/{seed.project_id}/tickets", headers=headers))
+                    for _ in range(4)
+                ]
+                await asyncio.sleep(0.3)
+                assert not any(task.done() for task in reads)
+                ping = await asyncio.wait_for(http.get("/ping"), timeout=2)
+                assert ping.status_code == 200
+            finally:
+                writer.rollback()
+                writer.close()
+            responses = await asyncio.gather(*reads)
+        await async_engine.dispose()
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200] * 4
+
+
+# the list route as it was before: sync, in the threadpool, on sync sessions
+baseline = FastAPI()
+
+
+@baseline.get("/projects/{project_id}/tickets")
+def list_tickets_sync(
+    project_id: int,
+    db: Session = Depends(get_db),
+    auth: AuthContext = Depends(get_auth_context),
+):
+    assert auth.is_project_admin(project_id)
+    tickets, _ = ticket_repo.get_tickets_page(db, project_id, TicketFilter(), None, ticket_repo.DEFAULT_PAGE_SIZE)
+    return json_response(tickets)
+
+
+async def _requests_per_second(target, url: str, headers: dict) -> float:
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        remaining = iter(range(BENCH_REQUESTS))
+
+        async def worker():
+            for _ in remaining:
+                response = await http.get(url, headers=headers)
+                assert response.status_code == 200, response.text
+
+        await http.get(url, headers=headers)  # warm up connections and caches
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(BENCH_CONCURRENCY)))
+        return BENCH_REQUESTS / (time.perf_counter() - start)
+
+
+@benchmark
+def test_list_throughput_under_concurrent_reads(db, seed):
+    db.execute(insert(models.Ticket), [
+        {
+            "title": f"T{n}", "description": "text", "type": TicketType.user, "created_by": seed.alice,
+            "assigned_to": seed.bob, "team_id": seed.team_id, "project_id": seed.project_id,
+        }
+        for n in range(500)
+    ])
+    db.commit()
+    headers = auth_headers(seed.alice)
+    url = f"/projects/{seed.project_id}/tickets"
+
+    async def scenario():
+        before = await _requests_per_second(baseline, url, headers)
+        after = await _requests_per_second(app, url, headers)
+        await async_engine.dispose()
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    print(
+        f"\n{BENCH_CONCURRENCY} concurrent GET {url}: "
+        f"sync route {before:,.0f} req/s, async route {after:,.0f} req/s ({after / before:.2f}x)"
+    )
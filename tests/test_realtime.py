@@ -0,0 +1,94 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from tickets import realtime
+from tickets.jwttoken import create_access_token
+
+from conftest import auth_headers, post_ticket
+
+
+def test_notifies_a_whole_transaction_in_one_statement(monkeypatch):
+    monkeypatch.setattr(realtime, "USE_PG_NOTIFY", True)
+    executed = []
+    session = SimpleNamespace(
+        info={realtime._OUTBOX: [(1, {"type": "ticket", "ticket_id": n}) for n in range(3)]},
+        execute=lambda statement, params=None: executed.append((statement, params)),
+    )
+
+    realtime._notify_in_transaction(session)
+
+    assert len(executed) == 1
+    statement, params = executed[0]
+    assert "unnest" in str(statement)
+    assert params["channel"] == realtime.REALTIME_CHANNEL
+    assert [json.loads(p) for p in params["payloads"]] == [
+        {"p": 1, "m": {"type": "ticket", "ticket_id": n}} for n in range(3)
+    ]
+
+
+def _connect(client, seed, user_id):
+    token = create_access_token({"sub": str(user_id)})
+    return client.websocket_connect(f"/ws/projects/{seed.project_id}?token={token}")
+
+
+def _wait_for_connections(n: int) -> None:
+    # the handler unsubscribes on its way out; leaving the test client's
+    # session while a handler still runs cancels it mid-cleanup
+    deadline = time.monotonic() + 2
+    while realtime.hub.stats()["connections"] != n:
+        assert time.monotonic() < deadline, realtime.hub.stats()
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+
+def test_removed_member_socket_is_closed(client, seed):
+    with _connect(client, seed, seed.bob) as bob, _connect(client, seed, seed.carol) as carol:
+        ticket = post_ticket(client, seed.project_id, seed.alice)
+        assert bob.receive_json()["ticket_id"] == ticket["id"]
+        assert carol.receive_json()["ticket_id"] == ticket["id"]
+
+        response = client.delete(
+            f"/teams/{seed.team_id}/projects/{seed.project_id}/members/{seed.bob}",
+            headers=auth_headers(seed.alice),
+        )
+        assert response.status_code == 204, response.text
+
+        with pytest.raises(WebSocketDisconnect) as closed:
+            bob.receive_json()
+        assert closed.value.code == 1008
+        _wait_for_connections(1)
+        # the others stay connected and learn about it
+        assert carol.receive_json() == {"type": "member_removed", "user_id": seed.bob}
+        carol.close()
+        _wait_for_connections(0)
+
+
+def test_member_removed_from_the_team_is_closed_and_kept_out(client, seed):
+    with _connect(client, seed, seed.bob) as bob, _connect(client, seed, seed.carol) as carol:
+        response = client.delete(f"/teams/{seed.team_id}/members/{seed.bob}", headers=auth_headers(seed.alice))
+        assert response.status_code == 204, response.text
+
+        with pytest.raises(WebSocketDisconnect) as closed:
+            bob.receive_json()
+        assert closed.value.code == 1008
+        _wait_for_connections(1)
+        assert carol.receive_json() == {"type": "member_removed", "user_id": seed.bob}
+        carol.close()
+        _wait_for_connections(0)
+
+    # still listed in the project, but out of its team
+    with pytest.raises(WebSocketDisconnect) as refused:
+        with _connect(client, seed, seed.bob) as bob:
+            bob.receive_json()
+    assert refused.value.code == 1008
+
+
+def test_non_member_cannot_connect(client, seed):
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with _connect(client, seed, seed.dave) as dave:
+            dave.receive_json()
+    assert closed.value.code == 1008
@@ -0,0 +1,128 @@
+import random
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from tickets import database, models
+from tickets.auth_context import AuthContext
+from tickets.database import SessionLocal, get_async_read_db, get_read_db
+from tickets.oauth2 import get_current_user
+from tickets.routers.dependencies import get_auth_context, get_read_auth_context
+
+from conftest import auth_headers
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    # each "replica" answers with its own name, so a read shows where it went
+    engines = []
+    for i in range(2):
+        eng = create_engine(f"sqlite:///{tmp_path / f'replica{i}.db'}")
+        with eng.begin() as conn:
+            conn.execute(text("CREATE TABLE origin (name TEXT)"))
+            conn.execute(text("INSERT INTO origin VALUES (:name)"), {"name": f"replica{i}"})
+        engines.append(eng)
+    yield engines
+    for eng in engines:
+        eng.dispose()
+
+
+def _origin(db) -> str:
+    return db.execute(text("SELECT name FROM origin")).scalar_one()
+
+
+def test_session_keeps_the_replica_of_its_first_read(replicas, monkeypatch):
+    picks = []
+    def choice(seq):
+        picks.append(seq)
+        return random.Random(len(picks)).choice(seq)
+    monkeypatch.setattr(database.random, "choice", choice)
+
+    for _ in range(5):
+        with SessionLocal() as db:
+            db.info["replicas"] = replicas
+            assert len({_origin(db) for _ in range(10)}) == 1
+    assert len(picks) == 5  # one pick per session, not per statement
+
+
+def test_writes_and_reads_after_them_go_to_the_primary(seed, replicas):
+    with SessionLocal() as db:
+        db.info["replicas"] = replicas
+        assert _origin(db).startswith("replica")
+        db.add(models.User(name="erin", password="x"))
+        db.flush()
+        assert db.execute(select(models.User.id).where(models.User.name == "erin")).scalar_one()
+        db.rollback()
+
+
+def _counting(monkeypatch, name):
+    factory = getattr(database, name)
+    opened = []
+    def counted(*args, **kwargs):
+        opened.append(1)
+        return factory(*args, **kwargs)
+    monkeypatch.setattr(database, name, counted)
+    return opened
+
+
+def test_sync_read_route_and_its_auth_share_one_session(seed, replicas, monkeypatch):
+    monkeypatch.setattr(database, "replica_engines", replicas)
+    opened = _counting(monkeypatch, "SessionLocal")
+    app = FastAPI()
+
+    @app.get("/probe")
+    def probe(db=Depends(get_read_db), user: models.User = Depends(get_current_user)):
+        return {"same_session": user in db, "replica": _origin(db)}
+
+    response = TestClient(app).get("/probe", headers=auth_headers(seed.alice))
+    assert response.status_code == 200
+    assert response.json()["same_session"]
+    assert response.json()["replica"].startswith("replica")
+    assert len(opened) == 1
+
+
+# the replicas have no users or memberships at all: a replica that lags behind
+# every write. Auth still works because it reads from the primary.
+def test_sync_auth_reads_the_primary(seed, replicas, monkeypatch):
+    monkeypatch.setattr(database, "replica_engines", replicas)
+    app = FastAPI()
+
+    @app.get("/probe")
+    def probe(db=Depends(get_read_db), auth: AuthContext = Depends(get_auth_context)):
+        return {"member": auth.is_project_member(seed.project_id), "replica": _origin(db)}
+
+    response = TestClient(app).get("/probe", headers=auth_headers(seed.bob))
+    assert response.status_code == 200, response.text
+    assert response.json()["member"]
+    assert response.json()["replica"].startswith("replica")
+
+
+def test_async_auth_reads_the_primary(seed, replicas, monkeypatch):
+    async_replicas = [create_async_engine(eng.url.set(drivername="sqlite+aiosqlite")) for eng in replicas]
+    monkeypatch.setattr(database, "async_replica_engines", async_replicas)
+    app = FastAPI()
+
+    @app.get("/probe")
+    async def probe(
+        db: AsyncSession = Depends(get_async_read_db),
+        auth: AuthContext = Depends(get_read_auth_context),
+    ):
+        return {"member": auth.is_project_member(seed.project_id), "replica": await db.run_sync(_origin)}
+
+    with TestClient(app) as test_client:
+        response = test_client.get("/probe", headers=auth_headers(seed.bob))
+        for eng in async_replicas:
+            test_client.portal.call(eng.dispose)
+    assert response.status_code == 200, response.text
+    assert response.json()["member"]
+    assert response.json()["replica"].startswith("replica")
+
+
+def test_async_read_route_and_its_auth_share_one_session(client, seed, monkeypatch):
+    opened = _counting(monkeypatch, "AsyncSessionLocal")
+    response = client.get(f"/projects/{seed.project_id}/tickets/counts", headers=auth_headers(seed.alice))
+    assert response.status_code == 200
+    assert len(opened) == 1
@@ -0,0 +1,44 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# generous for CI noise; ~1s on a dev laptop. Override when profiling startup
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "3"))
+HEAVY_MODULES = ("pandas", "google.generativeai")
+
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import tickets.main
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _import_main(db_path: Path) -> dict:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_import_skips_heavy_modules_and_schema(tmp_path):
+    db_path = tmp_path / "boot.db"
+    assert _import_main(db_path)["heavy"] == []
+    if db_path.exists():
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == []
+
+
+def test_import_within_budget(tmp_path):
+    # best of two, a single cold run mostly measures the disk cache
+    seconds = min(_import_main(tmp_path / "boot.db")["seconds"] for _ in range(2))
+    assert seconds < IMPORT_BUDGET_SECONDS, f"importing tickets.main took {seconds:.2f}s"
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from tickets import models
+from tickets.database import DATABASE_URL, engine
+from tickets.repository import ticket_counts
+
+from conftest import auth_headers, post_ticket
+
+
+@pytest.fixture
+def race():
+    """Runs `sql` from another connection right before the batch's first write."""
+    pending = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if pending and statement.lstrip().upper().startswith(("UPDATE TICKETS", "DELETE FROM TICKETS")):
+            other = sqlite3.connect(make_url(DATABASE_URL).database)
+            with other:
+                other.execute(*pending.pop())
+            other.close()
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    yield pending.append
+    event.remove(engine, "before_cursor_execute", before_execute)
+
+
+def _batch(client, seed, user_id, *operations):
+    response = client.post(
+        f"/projects/{seed.project_id}/tickets:batch",
+        json={"operations": list(operations)},
+        headers=auth_headers(user_id),
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_batch_applies_every_valid_operation(client, seed, db):
+    a = post_ticket(client, seed.project_id, seed.alice)["id"]
+    b = post_ticket(client, seed.project_id, seed.alice)["id"]
+    results = _batch(
+        client, seed, seed.bob,
+        {"op": "status", "ticket_id": a, "status": "in_progress"},
+        {"op": "status", "ticket_id": b, "status": "closed"},
+    )
+    assert [(r["ok"], r["status_code"]) for r in results] == [(True, 200), (False, 400)]
+    ticket = db.get(models.Ticket, a)
+    assert (ticket.status.value, ticket.version) == ("in_progress", 2)
+
+
+def test_concurrent_change_fails_only_that_ticket(client, seed, db, race):
+    a = post_ticket(client, seed.project_id, seed.alice)["id"]
+    b = post_ticket(client, seed.project_id, seed.alice)["id"]
+    race(("UPDATE tickets SET title = 'edited', version = version + 1 WHERE id = ?", (a,)))
+
+    results = _batch(
+        client, seed, seed.bob,
+        {"op": "status", "ticket_id": a, "status": "in_progress"},
+        {"op": "status", "ticket_id": b, "status": "in_progress"},
+    )
+    assert results[0]["status_code"] == 409
+    assert results[0]["detail"] == "Ticket was modified (version 2), reload and retry"
+    assert results[1]["ok"] and results[1]["status_code"] == 200
+
+    db.expire_all()
+    assert db.get(models.Ticket, a).status.value == "open"
+    assert db.get(models.Ticket, b).status.value == "in_progress"
+    # the lost operation left no event and no counter change behind
+    kinds = [e.kind for e in db.query(models.TicketEvent).filter_by(ticket_id=a)]
+    assert kinds == [1]  # created
+    assert ticket_counts.reconcile(db, repair=False) == 0
+
+
+def test_ticket_deleted_meanwhile_is_not_found(client, seed, db, race):
+    a = post_ticket(client, seed.project_id, seed.alice)["id"]
+    race(("DELETE FROM tickets WHERE id = ?", (a,)))
+
+    results = _batch(client, seed, seed.alice, {"op": "delete", "ticket_id": a})
+    assert (results[0]["ok"], results[0]["status_code"], results[0]["detail"]) == (False, 404, "Ticket not found")
+    assert db.query(models.TicketEvent).filter_by(ticket_id=a, kind=5).count() == 0
+
+
+@pytest.mark.parametrize("target, code", [
+    ("bob", 200),     # project member
+    ("alice", 403),   # project admin, not a member or worker
+    ("dave", 403),    # in the team, not the project
+    ("carol", 400),   # member, but unavailable
+])
+def test_batch_and_single_reassign_share_one_rule(client, seed, db, target, code):
+    db.get(models.User, seed.carol).is_available = False
+    db.commit()
+    user_id = getattr(seed, target)
+    single = post_ticket(client, seed.project_id, seed.alice)["id"]
+    batched = post_ticket(client, seed.project_id, seed.alice)["id"]
+
+    response = client.put(
+        f"/projects/{seed.project_id}/tickets/{single}/assignee",
+        json={"assigned_to": user_id},
+        headers=auth_headers(seed.alice),
+    )
+    (result,) = _batch(client, seed, seed.alice, {"op": "reassign", "ticket_id": batched, "assigned_to": user_id})
+
+    assert response.status_code == code, response.text
+    assert result["status_code"] == code
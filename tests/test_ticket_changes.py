@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import insert, literal
+
+from tickets import models
+from tickets.enums import TicketEventKind
+from tickets.repository import ticket_event
+
+from conftest import auth_headers, post_ticket
+
+
+def changes(client, seed, since=None, limit=None):
+    params = {k: v for k, v in (("since", since), ("limit", limit)) if v is not None}
+    response = client.get(
+        f"/projects/{seed.project_id}/tickets/changes", params=params, headers=auth_headers(seed.alice)
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def read_snapshot(client, seed, limit):
+    pages = [changes(client, seed, limit=limit)]
+    while pages[-1]["has_more"]:
+        pages.append(changes(client, seed, since=pages[-1]["cursor"], limit=limit))
+    return pages
+
+
+def test_snapshot_is_paged_then_continues_from_the_log(client, seed):
+    ids = [post_ticket(client, seed.project_id, seed.alice, title=f"T{n}")["id"] for n in range(5)]
+
+    pages = read_snapshot(client, seed, limit=2)
+
+    assert [len(p["tickets"]) for p in pages] == [2, 2, 1]
+    assert all(p["snapshot"] for p in pages)
+    assert sorted(t["id"] for p in pages for t in p["tickets"]) == sorted(ids)
+
+    new = post_ticket(client, seed.project_id, seed.alice, title="After")
+    delta = changes(client, seed, since=pages[-1]["cursor"])
+    assert not delta["snapshot"]
+    assert [t["id"] for t in delta["tickets"]] == [new["id"]]
+
+
+def test_change_while_paging_the_snapshot_is_sent_after_it(client, seed):
+    first, second = (post_ticket(client, seed.project_id, seed.alice)["id"] for _ in range(2))
+    page = changes(client, seed, limit=1)
+    assert page["has_more"]
+
+    response = client.put(
+        f"/projects/{seed.project_id}/tickets/{first}/status",
+        json={"status": "in_progress"},
+        headers=auth_headers(seed.bob),
+    )
+    assert response.status_code == 200, response.text
+    added = post_ticket(client, seed.project_id, seed.alice)["id"]
+
+    last = changes(client, seed, since=page["cursor"], limit=1)
+    assert not last["has_more"]
+    delta = changes(client, seed, since=last["cursor"])
+    assert {t["id"]: t["status"] for t in delta["tickets"]} == {first: "in_progress", added: "open"}
+    assert second not in {t["id"] for t in delta["tickets"]}
+
+
+def test_late_commit_below_the_cursor_is_not_skipped(client, seed, db, monkeypatch):
+    """
+    Postgres order: txid 7 takes its event id first but is still open while txid 4
+    commits. The reader stops below the horizon, so 7 is read once it has finished.
+    """
+    early, late = (post_ticket(client, seed.project_id, seed.alice)["id"] for _ in range(2))
+    cursor = read_snapshot(client, seed, limit=10)[-1]["cursor"]
+
+    horizon = {"xmin": 5}
+    monkeypatch.setattr(ticket_event, "_commit_horizon", lambda: literal(horizon["xmin"]))
+    db.execute(insert(models.TicketEvent), [
+        {"ticket_id": late, "project_id": seed.project_id, "kind": int(TicketEventKind.feedback), "txid": 7},
+        {"ticket_id": early, "project_id": seed.project_id, "kind": int(TicketEventKind.feedback), "txid": 4},
+    ])
+    db.commit()
+
+    delta = changes(client, seed, since=cursor)
+    assert [t["id"] for t in delta["tickets"]] == [early]
+
+    assert changes(client, seed, since=delta["cursor"])["tickets"] == []
+    horizon["xmin"] = 8
+    delta = changes(client, seed, since=delta["cursor"])
+    assert [t["id"] for t in delta["tickets"]] == [late]
+
+
+@pytest.mark.parametrize("cursor", ["abc", "12", "-1.3", "1.x"])
+def test_invalid_cursor_is_rejected(client, seed, cursor):
+    response = client.get(
+        f"/projects/{seed.project_id}/tickets/changes", params={"since": cursor}, headers=auth_headers(seed.alice)
+    )
+    assert response.status_code == 400
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from tickets import models
+from tickets.enums import TicketType
+from tickets.repository import ticket as ticket_repo
+from tickets.routers.team_ticket import NEXT_CURSOR_HEADER
+
+from conftest import auth_headers
+
+TICKETS = ticket_repo.DEFAULT_PAGE_SIZE + 5
+
+
+@pytest.fixture
+def many(db, seed):
+    start = datetime(2025, 1, 1)
+    db.execute(insert(models.Ticket), [
+        {
+            "title": f"T{n}", "description": "text", "type": TicketType.user, "created_by": seed.alice,
+            "assigned_to": seed.bob, "team_id": seed.team_id, "project_id": seed.project_id,
+            "created_at": start + timedelta(minutes=n),
+        }
+        for n in range(TICKETS)
+    ])
+    db.commit()
+    return seed
+
+
+def get_list(client, seed, **params):
+    response = client.get(f"/projects/{seed.project_id}/tickets", params=params, headers=auth_headers(seed.alice))
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_without_limit_or_cursor_the_whole_list_comes_back(client, many):
+    response = get_list(client, many)
+    assert len(response.json()) == TICKETS
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_pages_follow_the_next_cursor(client, many):
+    first = get_list(client, many, limit=ticket_repo.DEFAULT_PAGE_SIZE)
+    assert len(first.json()) == ticket_repo.DEFAULT_PAGE_SIZE
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+
+    # a cursor alone pages with the default size
+    rest = get_list(client, many, cursor=cursor)
+    assert len(rest.json()) == 5
+    assert NEXT_CURSOR_HEADER not in rest.headers
+    ids = [t["id"] for t in first.json() + rest.json()]
+    assert ids == [t["id"] for t in get_list(client, many).json()]
@@ -0,0 +1,101 @@
+from sqlalchemy import event, insert
+
+from tickets import models
+from tickets.database import async_engine
+from tickets.enums import TicketType
+from tickets.repository import ticket_search
+from tickets.repository.ticket_search import InvertedIndex
+
+from conftest import auth_headers, post_ticket
+
+
+def _search(client, seed, q, user_id=None):
+    response = client.get(
+        f"/projects/{seed.project_id}/tickets/search",
+        params={"q": q},
+        headers=auth_headers(user_id or seed.bob),
+    )
+    assert response.status_code == 200, response.text
+    return [t["id"] for t in response.json()]
+
+
+def test_sqlite_uses_the_in_process_index():
+    assert not ticket_search.USE_PG_FTS
+
+
+def test_title_hits_rank_above_description_hits():
+    index = InvertedIndex()
+    index.upsert(1, 10, "Printer on floor 2", "paper jam")
+    index.upsert(1, 11, "Paper jam", "the printer on floor 3")
+    index.upsert(1, 12, "Coffee machine", "empty")
+    assert index.search(1, "printer", 10) == [10, 11]
+    assert index.search(1, "jam", 10) == [11, 10]
+
+
+def test_every_word_must_match():
+    index = InvertedIndex()
+    index.upsert(1, 10, "Printer jam", "")
+    index.upsert(1, 11, "Printer offline", "")
+    assert index.search(1, "printer JAM", 10) == [10]
+    assert index.search(1, "printer toner", 10) == []
+    assert index.search(1, "!!", 10) == []
+
+
+def test_projects_do_not_leak():
+    index = InvertedIndex()
+    index.upsert(1, 10, "Printer", "")
+    index.upsert(2, 20, "Printer", "")
+    assert index.search(2, "printer", 10) == [20]
+
+
+def test_created_and_deleted_tickets_update_the_index(client, seed):
+    first = post_ticket(client, seed.project_id, seed.alice, title="VPN drops", description="every hour")
+    assert _search(client, seed, "vpn") == [first["id"]]  # loads the project once
+
+    second = post_ticket(client, seed.project_id, seed.alice, title="VPN slow", description="")
+    assert sorted(_search(client, seed, "vpn")) == sorted([first["id"], second["id"]])
+
+    deleted = client.delete(f"/projects/{seed.project_id}/tickets/{first['id']}", headers=auth_headers(seed.alice))
+    assert deleted.status_code == 204
+    assert _search(client, seed, "vpn") == [second["id"]]
+
+
+def test_batch_writes_update_the_index(client, seed):
+    old = post_ticket(client, seed.project_id, seed.alice, title="Badge reader", description="")
+    _search(client, seed, "badge")
+    results = client.post(
+        f"/projects/{seed.project_id}/tickets:batch",
+        json={"operations": [
+            {"op": "create", "title": "Badge printer", "description": "", "type": "user", "assigned_to_name": "bob"},
+            {"op": "delete", "ticket_id": old["id"]},
+        ]},
+        headers=auth_headers(seed.alice),
+    ).json()
+    assert _search(client, seed, "badge") == [results[0]["ticket_id"]]
+
+
+def test_project_is_read_from_the_db_once(client, db, seed):
+    post_ticket(client, seed.project_id, seed.alice, title="Laptop broken", description="")
+    loads = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # the load reads id, title, description of the whole project, without joins
+        if "tickets.description" in statement and "JOIN" not in statement.upper():
+            loads.append(statement)
+
+    # the search route reads through the async engine
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        assert len(_search(client, seed, "laptop")) == 1
+        assert len(loads) == 1
+        # written behind the index's back: only a reload would find it
+        db.execute(insert(models.Ticket), [{
+            "title": "Laptop charger", "description": "", "type": TicketType.user, "created_by": seed.alice,
+            "assigned_to": seed.bob, "team_id": seed.team_id, "project_id": seed.project_id,
+        }])
+        db.commit()
+        assert len(_search(client, seed, "laptop")) == 1
+        assert len(_search(client, seed, "broken")) == 1
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert len(loads) == 1
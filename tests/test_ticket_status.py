@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event
+
+from tickets import models
+from tickets.database import engine
+from tickets.enums import TicketEventKind, TicketStatus
+from tickets.repository import ticket_counts
+
+from conftest import auth_headers, post_ticket
+
+
+@pytest.fixture
+def ticket(client, seed):
+    return post_ticket(client, seed.project_id, seed.alice, assigned_to_name="bob")
+
+
+def put_status(client, seed, ticket_id, body):
+    return client.put(
+        f"/projects/{seed.project_id}/tickets/{ticket_id}/status", json=body, headers=auth_headers(seed.bob)
+    )
+
+
+@pytest.fixture
+def in_lockstep():
+    """Holds every UPDATE of tickets until two requests have reached it."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def hold(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE tickets"):
+            barrier.wait()
+
+    event.listen(engine, "before_cursor_execute", hold)
+    yield
+    event.remove(engine, "before_cursor_execute", hold)
+
+
+def test_racing_writers_one_wins_one_conflicts(client, seed, db, ticket, in_lockstep):
+    body = {"status": "in_progress", "expected_version": ticket["version"]}
+    with ThreadPoolExecutor(2) as pool:
+        responses = list(pool.map(lambda _: put_status(client, seed, ticket["id"], body), range(2)))
+
+    assert sorted(r.status_code for r in responses) == [200, 409]
+    winner = next(r for r in responses if r.status_code == 200).json()
+    assert winner["status"] == "in_progress"
+    assert winner["version"] == ticket["version"] + 1
+
+    row = db.get(models.Ticket, ticket["id"])
+    assert (row.status, row.version) == (TicketStatus.in_progress, ticket["version"] + 1)
+    # the loser wrote nothing: one status event, counters moved once
+    events = db.query(models.TicketEvent).filter_by(ticket_id=ticket["id"], kind=int(TicketEventKind.status)).count()
+    assert events == 1
+    counts = ticket_counts.project_counts(db, seed.project_id)
+    assert (counts["open"], counts["in_progress"]) == (0, 1)
+
+
+def test_stale_version_is_a_conflict(client, seed, ticket):
+    response = put_status(client, seed, ticket["id"], {"status": "in_progress", "expected_version": 7})
+    assert response.status_code == 409
+    assert put_status(client, seed, ticket["id"], {"status": "in_progress"}).status_code == 200
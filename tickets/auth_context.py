@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+from sqlalchemy import Integer, String, literal, null, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+from tickets.models import UserTeam, ProjectUser, Project, WorkerTeamMember
+from tickets.enums import TeamRole, ProjectRole
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """
+    Every membership of one user, loaded once per request.
+    Roles are kept as plain enum values ("admin", "member", "worker").
+    """
+    user_id: int
+    teams: Mapping[int, str]          # team_id -> TeamRole
+    projects: Mapping[int, str]       # project_id -> ProjectRole
+    project_teams: Mapping[int, int]  # project_id -> team_id of that project
+    worker_teams: Mapping[int, str]   # worker_team_id -> WorkerRole
+
+    def team_role(self, team_id: int) -> Optional[str]:
+        return self.teams.get(team_id)
+
+    def is_team_member(self, team_id: int) -> bool:
+        return team_id in self.teams
+
+    def is_team_admin(self, team_id: int) -> bool:
+        return self.teams.get(team_id) == TeamRole.admin.value
+
+    def project_role(self, project_id: int) -> Optional[str]:
+        return self.projects.get(project_id)
+
+    def is_project_member(self, project_id: int) -> bool:
+        return project_id in self.projects
+
+    def is_project_admin(self, project_id: int) -> bool:
+        return self.projects.get(project_id) == ProjectRole.admin.value
+
+    def worker_team_role(self, worker_team_id: int) -> Optional[str]:
+        return self.worker_teams.get(worker_team_id)
+
+
+def load_auth_context(db: Session, user_id: int) -> AuthContext:
+    # one round-trip: team, project and worker-team links glued with UNION ALL
+    # roles are read as strings because the three enum types differ
+    stmt = union_all(
+        select(
+            literal("team").label("kind"),
+            UserTeam.team_id.label("id"),
+            type_coerce(UserTeam.role, String).label("role"),
+            type_coerce(null(), Integer).label("team_id"),
+        ).where(UserTeam.user_id == user_id),
+        select(
+            literal("project"),
+            ProjectUser.project_id,
+            type_coerce(ProjectUser.role, String),
+            Project.team_id,
+        )
+        .join(Project, Project.id == ProjectUser.project_id)
+        .where(ProjectUser.user_id == user_id),
+        select(
+            literal("worker_team"),
+            WorkerTeamMember.worker_team_id,
+            type_coerce(WorkerTeamMember.role, String),
+            type_coerce(null(), Integer),
+        ).where(WorkerTeamMember.user_id == user_id),
+    )
+
+    teams: dict[int, str] = {}
+    projects: dict[int, str] = {}
+    project_teams: dict[int, int] = {}
+    worker_teams: dict[int, str] = {}
+    for kind, id_, role, team_id in db.execute(stmt):
+        if kind == "team":
+            teams[id_] = role
+        elif kind == "project":
+            projects[id_] = role
+            project_teams[id_] = team_id
+        else:
+            worker_teams[id_] = role
+
+    return AuthContext(
+        user_id=user_id,
+        teams=MappingProxyType(teams),
+        projects=MappingProxyType(projects),
+        project_teams=MappingProxyType(project_teams),
+        worker_teams=MappingProxyType(worker_teams),
+    )
@@ -1,25 +1,188 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, Insert, Update, Delete
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from fastapi import Depends, Request
 import os
+import random
 from dotenv import load_dotenv
+from . import db_pool
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# size against postgres max_connections: workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) * 2 engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# comma separated, empty = every query goes to the primary
+DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+# how long a client that just wrote keeps reading from the primary (max tolerated replica lag)
+REPLICA_STALENESS_SECONDS = int(os.getenv("REPLICA_STALENESS_SECONDS", "5"))
+READ_PRIMARY_HEADER = "X-Read-Primary"
+READ_PIN_COOKIE = "read_primary"
+
 # Fail-fast
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set in environment variables.")
 
 
-engine = create_engine(DATABASE_URL)
+def _async_url(url: str) -> URL:
+    # same database through an asyncio driver
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg")
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite")
+    raise ValueError(f"No async driver configured for {backend}, set ASYNC_DATABASE_URL.")
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+
+def _pool_kwargs(url, poolclass) -> dict:
+    # sqlite picks its own pool (SingletonThreadPool for :memory:), leave it alone
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _make_engine(url, name: str):
+    kwargs = _pool_kwargs(url, db_pool.InstrumentedQueuePool)
+    eng = create_engine(url, pool_logging_name=name, **kwargs)
+    db_pool.register(name, eng)
+    return eng
+
+
+def _make_async_engine(url, name: str):
+    kwargs = _pool_kwargs(url, db_pool.InstrumentedAsyncQueuePool)
+    eng = create_async_engine(url, pool_logging_name=name, **kwargs)
+    db_pool.register(name, eng)
+    return eng
+
+
+engine = _make_engine(DATABASE_URL, "primary")
+async_engine = _make_async_engine(ASYNC_DATABASE_URL, "primary_async")
+
+replica_engines = [
+    _make_engine(url, f"replica{i}") for i, url in enumerate(DATABASE_REPLICA_URLS)
+]
+async_replica_engines = [
+    _make_async_engine(_async_url(url), f"replica{i}_async") for i, url in enumerate(DATABASE_REPLICA_URLS)
+]
+
+
+class RoutingSession(Session):
+    """
+    Session bound to the primary. When info["replicas"] is set (read-only request)
+    plain SELECTs go to a replica until the session writes anything. The replica
+    is picked on the first read and kept, so one request never mixes replicas
+    that lag by different amounts. Statements run through on_primary never go
+    to a replica.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replicas = self.info.get("replicas")
+        if (
+            replicas
+            and not self.info.get("primary")
+            and not self._flushing
+            and not self.info.get("wrote")
+            and not isinstance(clause, (Insert, Update, Delete))
+        ):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = random.choice(replicas)
+            return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def on_primary(session: Session, fn, *args):
+    """
+    fn(session, *args) with every statement on the primary, also in a replica-routed
+    session. For authentication and membership: a lagging replica would refuse a
+    member who was just added and still let in one who was just removed.
+    """
+    previous = session.info.get("primary")
+    session.info["primary"] = True
+    try:
+        return fn(session, *args)
+    finally:
+        session.info["primary"] = previous
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session):
+    # lets main.pin_reads_after_write keep this client on the primary for a while
+    state = session.info.get("request_state")
+    if state is not None and session.info.get("wrote"):
+        state.db_wrote = True
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
-def get_db():
+# Session checks out a pool connection on its first query, not here,
+# so routes that never touch the db do not hold a connection
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["request_state"] = request.state
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# for async def routes, queries are awaited instead of blocking the event loop
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info["request_state"] = request.state
+        yield db
+
+
+def _may_read_replica(request: Request) -> bool:
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+        return False
+    # client wrote less than REPLICA_STALENESS_SECONDS ago
+    return READ_PIN_COOKIE not in request.cookies
+
+# read-only routes: may be served by a replica, see RoutingSession.
+# it is the request's get_db session, so auth dependencies share it instead of opening
+# a second one; they query through on_primary
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    if replica_engines and _may_read_replica(request):
+        db.info["replicas"] = replica_engines
+    return db
+
+
+async def get_async_read_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        if async_replica_engines and _may_read_replica(request):
+            db.sync_session.info["replicas"] = [e.sync_engine for e in async_replica_engines]
+        yield db
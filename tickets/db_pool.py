@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+def _percentile(samples: list[float], p: float) -> Optional[float]:
+    if not samples:
+        return None
+    return round(samples[min(len(samples) - 1, int(p * len(samples)))], 2)
+
+
+class PoolMetrics:
+    """Wait time, checkout duration and saturation of one engine pool."""
+
+    def __init__(self, name: str, samples: int = 2048):
+        self.name = name
+        self.engine = None
+        self.timeouts = 0
+        self._waits: deque[float] = deque(maxlen=samples)
+        self._checkouts: deque[float] = deque(maxlen=samples)
+        self._lock = threading.Lock()
+
+    def record_wait(self, ms: float) -> None:
+        with self._lock:
+            self._waits.append(ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def attach(self, engine) -> None:
+        self.engine = engine
+        # async engines expose pool events on their sync facade
+        target = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(target, "checkout")
+        def _on_checkout(dbapi_conn, record, proxy):
+            record.info["checked_out_at"] = time.perf_counter()
+
+        @event.listens_for(target, "checkin")
+        def _on_checkin(dbapi_conn, record):
+            started = record.info.pop("checked_out_at", None)
+            if started is not None:
+                with self._lock:
+                    self._checkouts.append((time.perf_counter() - started) * 1000)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts = sorted(self._checkouts)
+            timeouts = self.timeouts
+        out = {
+            "wait_p50_ms": _percentile(waits, 0.50),
+            "wait_p99_ms": _percentile(waits, 0.99),
+            "checkout_p50_ms": _percentile(checkouts, 0.50),
+            "checkout_p99_ms": _percentile(checkouts, 0.99),
+            "timeouts": timeouts,
+        }
+        pool = getattr(getattr(self.engine, "sync_engine", self.engine), "pool", None)
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            out.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "saturation": round(pool.checkedout() / capacity, 2) if capacity else None,
+            })
+        return out
+
+
+# pool_logging_name -> metrics; survives pool.recreate() on engine.dispose()
+POOL_METRICS: dict[str, PoolMetrics] = {}
+
+
+class _TimedCheckout:
+    # time spent waiting for a free connection (includes connecting a new one)
+    def _do_get(self):
+        metrics = POOL_METRICS.get(self._orig_logging_name)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if metrics is not None:
+                metrics.record_timeout()
+            raise
+        finally:
+            if metrics is not None:
+                metrics.record_wait((time.perf_counter() - start) * 1000)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def register(name: str, engine) -> PoolMetrics:
+    metrics = POOL_METRICS.setdefault(name, PoolMetrics(name))
+    metrics.attach(engine)
+    return metrics
+
+
+def pool_stats() -> dict:
+    return {name: m.stats() for name, m in POOL_METRICS.items()}
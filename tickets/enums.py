@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 class TeamRole(str, Enum):
     admin  = "admin"   # supadmin
@@ -24,4 +24,12 @@ class TicketPriority(str, Enum):
 
 class TicketType(str, Enum):
     worker = "worker"
-    user = "user"
\ No newline at end of file
+    user = "user"
+
+# stored as a small int in ticket_events.kind
+class TicketEventKind(IntEnum):
+    created  = 1
+    status   = 2
+    assignee = 3
+    feedback = 4
+    deleted  = 5
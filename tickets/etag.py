@@ -0,0 +1,39 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+
+# clients must revalidate every time, but only get a body when something changed
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    # weak comparison: W/"x" and "x" are the same tag
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, response: Response, *parts) -> Optional[Response]:
+    """
+    Sets ETag on the response built from `parts` (a version watermark plus whatever
+    else shapes the body). Returns a 304 to send instead when If-None-Match matches.
+    """
+    etag = weak_etag(*parts)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+        )
+    return None
@@ -1,12 +1,94 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from passlib.context import CryptContext
 
-pwd_cxt = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "16"))
+HASH_RETRY_AFTER_SECONDS = int(os.getenv("HASH_RETRY_AFTER_SECONDS", "1"))
 
+# hashes with other rounds still verify, needs_update() flags them for rehash
+pwd_cxt = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+class HashingBusy(Exception):
+    """Every hashing slot is taken; the router turns this into 503 + Retry-After."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many password hashes in progress")
+        self.retry_after = retry_after
+
+
+class HashExecutor:
+    """
+    bcrypt runs here instead of the shared threadpool, awaited so the caller
+    holds no thread while it waits. At most workers + queue_limit calls are
+    admitted, the rest raise HashingBusy.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, samples: int = 1024):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._timings: deque[float] = deque(maxlen=samples)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusy(HASH_RETRY_AFTER_SECONDS)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, self._timed, fn, *args)
+        finally:
+            self._slots.release()
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._timings.append(elapsed_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            timings = sorted(self._timings)
+            rejected = self.rejected
+        def pct(p: float) -> Optional[float]:
+            if not timings:
+                return None
+            return round(timings[min(len(timings) - 1, int(p * len(timings)))], 1)
+        return {
+            "rounds": BCRYPT_ROUNDS,
+            "samples": len(timings),
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "rejected": rejected,
+        }
+
+
+hash_executor = HashExecutor(HASH_WORKERS, HASH_QUEUE_LIMIT)
+
+
+# all of these are awaited and may raise HashingBusy
 class Hash:
     @staticmethod
-    def bcrypt(password: str):
-        return pwd_cxt.hash(password)
+    async def bcrypt(password: str) -> str:
+        return await hash_executor.run(pwd_cxt.hash, password)
+
+    @staticmethod
+    async def verify(hashed_password: str, plain_password: str) -> bool:
+        return await hash_executor.run(pwd_cxt.verify, plain_password, hashed_password)
 
+    # returns (valid, new_hash); new_hash is set when stored hash uses old rounds
     @staticmethod
-    def verify(hashed_password: str, plain_password: str) -> bool:
-        return pwd_cxt.verify(plain_password, hashed_password)
+    async def verify_and_update(hashed_password: str, plain_password: str) -> tuple[bool, Optional[str]]:
+        return await hash_executor.run(pwd_cxt.verify_and_update, plain_password, hashed_password)
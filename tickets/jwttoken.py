@@ -18,16 +18,19 @@ def create_access_token(data: dict):
     logging.info(f"token created for user_id={data.get('sub')}, timeleft:{expire}")
     return encoded_jwt
 
-def verify_token(token:str, credentials_exception):
+def decode_token(token: str, credentials_exception) -> dict:
     try:
         #this is just py dict, here we have subject and exp time
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None:
             logger.warning("Jwt dont have sub")
             raise credentials_exception
-        logger.info(f"Jwt verifified user_id={user_id}")
+        logger.debug(f"Jwt verifified user_id={payload.get('sub')}")
     except JWTError:
         logger.warning("Token error, verification error")
         raise credentials_exception
-    return int(user_id)
\ No newline at end of file
+    return payload
+
+def verify_token(token:str, credentials_exception):
+    payload = decode_token(token, credentials_exception)
+    return int(payload["sub"])
\ No newline at end of file
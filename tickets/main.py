@@ -1,11 +1,18 @@
+import hmac
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
 from dotenv import load_dotenv
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.middleware.cors import CORSMiddleware
-from . import models
-from .database import engine
-from .routers import team_ticket, team_user, chat_bot, auth, team, analytics, project, project_worker_team
+from .database import replica_engines, REPLICA_STALENESS_SECONDS, READ_PIN_COOKIE
+from .oauth2 import principal_cache
+from .hashing import hash_executor
+from .db_pool import pool_stats
+from .realtime import hub
+from .repository.workload import workload_index
+from .routers import team_ticket, team_user, chat_bot, auth, team, analytics, project, project_worker_team, realtime
 
 load_dotenv()
 
@@ -22,9 +29,15 @@ if FRONTEND_URL:
 if FRONTEND_LOCAL_URL:
     origins.append(FRONTEND_LOCAL_URL)
 
-models.Base.metadata.create_all(bind=engine)
+# starts the realtime hub (and its LISTEN relay on postgres) with the worker
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await hub.start()
+    yield
+    await hub.stop()
 
-app = FastAPI()
+# schema is created by `python -m tickets.manage migrate`, not on every boot
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     SessionMiddleware,
@@ -36,7 +49,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+
+# after a write, this client reads from the primary until replicas catch up
+@app.middleware("http")
+async def pin_reads_after_write(request: Request, call_next):
+    response = await call_next(request)
+    if replica_engines and REPLICA_STALENESS_SECONDS > 0 and getattr(request.state, "db_wrote", False):
+        response.set_cookie(
+            key=READ_PIN_COOKIE,
+            value="1",
+            max_age=REPLICA_STALENESS_SECONDS,
+            httponly=True,
+            secure=IS_PRODUCTION,
+            samesite="none" if IS_PRODUCTION else "lax",
+            path="/",
+        )
+    return response
+
 app.include_router(team_user.router)
 app.include_router(team_ticket.router)
 app.include_router(chat_bot.router)
@@ -45,7 +76,33 @@ app.include_router(auth.router)
 app.include_router(analytics.router)
 app.include_router(project.router)
 app.include_router(project_worker_team.router)
+app.include_router(realtime.router)
 @app.get("/ping")
 def ping():
     return {"message": "pong"}
 
+# scraped by monitoring with `Authorization: Bearer $METRICS_TOKEN`; without a token set it is off
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+def require_metrics_token(authorization: Optional[str] = Header(None)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            "Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+# in-process counters of this worker
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def metrics():
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hashing": hash_executor.stats(),
+        "db_pools": pool_stats(),
+        "realtime": hub.stats(),
+        "workload_index": workload_index.stats(),
+    }
+
@@ -0,0 +1,75 @@
+# python -m tickets.manage <command>
+import argparse
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from tickets import models
+from tickets.database import engine, SessionLocal
+from tickets.repository import ticket_counts
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns() -> None:
+    # create_all never alters an existing table; new columns need a server_default or nullable
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        preparer = conn.dialect.identifier_preparer
+        for table in models.Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}"))
+                logger.info("Added column %s.%s", table.name, column.name)
+
+
+def migrate() -> None:
+    new_counters = not inspect(engine).has_table(models.ProjectTicketCount.__tablename__)
+    models.Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    # create_all skips existing tables, so indexes added later need their own pass
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    if new_counters:
+        # counter tables start empty, fill them from the tickets already there
+        reconcile_counters()
+    logger.info("Schema is up to date")
+
+
+def reconcile_counters(repair: bool = True) -> int:
+    db = SessionLocal()
+    try:
+        off = ticket_counts.reconcile(db, repair=repair)
+    finally:
+        db.close()
+    if not off:
+        logger.info("Ticket counters match the tickets table")
+    elif repair:
+        logger.info("Repaired %d ticket counters", off)
+    else:
+        logger.info("%d ticket counters are off, run again without --dry-run to repair", off)
+    return off
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m tickets.manage")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="create missing tables, columns and indexes")
+    reconcile = sub.add_parser("reconcile-counters", help="recount tickets and fix drifted counters")
+    reconcile.add_argument("--dry-run", action="store_true", help="only report, change nothing")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        migrate()
+    elif args.command == "reconcile-counters":
+        # exit code 1 when something was off, so cron can alert on it
+        raise SystemExit(1 if reconcile_counters(repair=not args.dry_run) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 # tickets/models.py
 
-from sqlalchemy import Column, Integer, Boolean, String, ForeignKey, Text, DateTime, Enum as SqlEnum
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, Boolean, String, ForeignKey, Text, DateTime, Index, JSON, func, literal_column, Enum as SqlEnum
 from sqlalchemy.orm import relationship
 import random, string
 from datetime import datetime, timezone
@@ -112,6 +112,8 @@ class Ticket(Base):
     accepted_at    = Column(DateTime, nullable=True)
     closed_at      = Column(DateTime, nullable=True)
     updated_at     = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # bumped by every update, clients send it back as expected_version
+    version        = Column(Integer, nullable=False, default=1, server_default="1")
 
     type           = Column(SqlEnum(TicketType, native_enum=False), nullable=False, default=TicketType.worker)
     worker_team_id = Column(
@@ -129,6 +131,76 @@ class Ticket(Base):
     assignee       = relationship("User", back_populates="tickets_assigned", foreign_keys=[assigned_to])
     project        = relationship("Project", back_populates="tickets")
 
+    __table_args__ = (
+        # project list, newest first with (created_at, id) keyset cursor
+        Index("ix_tickets_project_created", "project_id", "created_at", "id"),
+        Index("ix_tickets_project_creator", "project_id", "created_by"),
+        Index("ix_tickets_project_assignee_status", "project_id", "assigned_to", "status"),
+        Index("ix_tickets_project_status", "project_id", "status"),
+        # analytics by team and admin workload grouping
+        Index("ix_tickets_team_status_assignee", "team_id", "status", "assigned_to"),
+    )
+
+
+# full-text document: title weighted A, description B. Rendered inline (no bound
+# params) so ticket_search's WHERE matches the GIN index expression exactly
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+ticket_search_document = func.setweight(
+    func.to_tsvector(SEARCH_CONFIG, Ticket.title), literal_column("'A'")
+).op("||")(
+    func.setweight(func.to_tsvector(SEARCH_CONFIG, Ticket.description), literal_column("'B'"))
+)
+Index("ix_tickets_search", ticket_search_document, postgresql_using="gin").ddl_if(dialect="postgresql")
+
+
+class TicketEvent(Base):
+    """
+    Append-only history of ticket changes, written in the same transaction as the change.
+    (txid, id) is the sequence in commit order: consumers keep the last pair they
+    processed and read past it, see repository/ticket_event.py.
+    """
+    __tablename__ = "ticket_events"
+    # sqlite only autoincrements INTEGER primary keys
+    id         = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    # no FK, events of deleted tickets stay
+    ticket_id  = Column(Integer, nullable=False)
+    project_id = Column(Integer, nullable=True)
+    team_id    = Column(Integer, nullable=True)
+    kind       = Column(SmallInteger, nullable=False)  # TicketEventKind
+    actor_id   = Column(Integer, nullable=True)
+    data       = Column(JSON, nullable=True)  # short keys, see repository/ticket_event.py
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    txid       = Column(BigInteger, nullable=False, server_default="0")  # writing transaction, 0 on sqlite
+
+    __table_args__ = (
+        Index("ix_ticket_events_project_seq", "project_id", "id"),
+        Index("ix_ticket_events_project_txid", "project_id", "txid", "id"),
+        Index("ix_ticket_events_team_seq", "team_id", "id"),
+        Index("ix_ticket_events_ticket", "ticket_id"),
+    )
+
+
+# denormalized counts, changed in the same transaction as the tickets (repository/ticket_counts.py);
+# python -m tickets.manage reconcile-counters checks them against the tickets table
+class ProjectTicketCount(Base):
+    __tablename__ = "project_ticket_counts"
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status     = Column(SqlEnum(TicketStatus, native_enum=False), primary_key=True)
+    count      = Column(Integer, nullable=False, default=0)
+
+
+class UserTicketCount(Base):
+    """Tickets assigned to the user, per project and status."""
+    __tablename__ = "user_ticket_counts"
+    user_id    = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status     = Column(SqlEnum(TicketStatus, native_enum=False), primary_key=True)
+    count      = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_user_ticket_counts_project", "project_id"),
+    )
+
 
 class Project(Base):
     __tablename__ = "projects"
@@ -206,9 +278,17 @@ class ChatMessage(Base):
     timestamp  = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     session    = relationship("SessionRecord")
 
+    __table_args__ = (
+        Index("ix_chat_messages_session_timestamp", "session_id", "timestamp"),
+    )
+
 class SessionRecord(Base):
     __tablename__ = "sessions"
     id         = Column(String, primary_key=True, index=True)
     user_id    = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     user       = relationship("User", back_populates="sessions")
+
+    __table_args__ = (
+        Index("ix_sessions_user_created", "user_id", "created_at"),
+    )
@@ -1,8 +1,16 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from . import jwttoken
 from . import models, database
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 import logging
 logger = logging.getLogger(__name__)
 
@@ -14,17 +22,147 @@ credentials_exception = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
-def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)) -> models.User:
-    logger.info("get_current_user is called")
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+
+@dataclass
+class _Principal:
+    user_id: int
+    snapshot: models.User  # detached, never attached to a session
+    expires_at: float      # time.monotonic() deadline
+
+
+def _snapshot(user: models.User) -> models.User:
+    # copy only column attributes, relationships stay lazy in the request session
+    snap = models.User(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        password=user.password,
+        is_available=user.is_available,
+    )
+    make_transient_to_detached(snap)
+    return snap
+
+
+class PrincipalCache:
+    """
+    LRU cache token digest -> authenticated user.
+    Entry lives min(ttl, token exp) and the cache never holds more than max_size tokens.
+    """
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _Principal]" = OrderedDict()
+        self._by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[_Principal]:
+        key = self._key(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, user: models.User, exp: Optional[int]) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, now + (exp - time.time()))
+        if expires_at <= now:
+            return
+        key = self._key(token)
+        entry = _Principal(user_id=user.id, snapshot=_snapshot(user), expires_at=expires_at)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._by_user.setdefault(entry.user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    #caller holds the lock
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry.user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry.user_id]
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_SIZE)
+
+
+def _request_token(request: Request, token: Optional[str]) -> str:
     if not token:
-        logger.warning("No token in header, trying cookies")
         token = request.cookies.get("access_token")
     if not token:
         logger.warning("No token in header or cookies")
         raise credentials_exception
+    return token
+
+
+def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)) -> models.User:
+    # the session may have replicas attached by get_read_db, the user is still read from the primary
+    token = _request_token(request, token)
+    return database.on_primary(db, lambda session: authenticate_token(token, session))
+
+
+# async read routes: the user is loaded through the same session the route queries with,
+# but from the primary
+async def get_current_read_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(database.get_async_read_db),
+) -> models.User:
+    token = _request_token(request, token)
+    return await db.run_sync(database.on_primary, lambda session: authenticate_token(token, session))
+
+
+# shared with the websocket endpoint, which has no Depends(oauth2_scheme)
+def authenticate_token(token: str, db: Session) -> models.User:
+    cached = principal_cache.get(token)
+    if cached is not None:
+        # attach a copy to this session without a SELECT
+        return db.merge(cached.snapshot, load=False)
+
     try:
-        user_id = jwttoken.verify_token(token, credentials_exception)
-        logger.info("Token verified, checking user_id in db")
+        payload = jwttoken.decode_token(token, credentials_exception)
+        user_id = int(payload["sub"])
     except Exception as e:
         logger.error(f"❌ Token verification failed: {e}")
         raise HTTPException(
@@ -35,5 +173,6 @@ def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db:
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
         raise credentials_exception
-    logger.info("Authentication successful")
+    principal_cache.put(token, user, payload.get("exp"))
+    logger.debug("Authentication successful user_id=%s", user_id)
     return user
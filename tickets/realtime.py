@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Iterable, Optional
+from sqlalchemy import ARRAY, Text, bindparam, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from .database import DATABASE_URL, RoutingSession, engine
+
+logger = logging.getLogger(__name__)
+
+# messages a connection may have queued before it is dropped as too slow
+REALTIME_QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", "256"))
+# postgres NOTIFY channel shared by every worker
+REALTIME_CHANNEL = os.getenv("REALTIME_CHANNEL", "ticket_changes")
+REALTIME_RECONNECT_SECONDS = int(os.getenv("REALTIME_RECONNECT_SECONDS", "2"))
+
+# with postgres every worker hears every commit through LISTEN,
+# otherwise (sqlite, single worker) commits are published in-process
+USE_PG_NOTIFY = engine.dialect.name == "postgresql"
+
+_OUTBOX = "realtime_outbox"
+
+# one round trip for the whole transaction, however many messages it queued
+_NOTIFY_ALL = text("SELECT pg_notify(:channel, p) FROM unnest(:payloads) AS p").bindparams(
+    bindparam("payloads", type_=ARRAY(Text))
+)
+
+
+class Subscriber:
+    """One connection: a bounded queue, None in it means "you were too slow, go away"."""
+
+    def __init__(self, project_id: int, maxsize: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def offer(self, message: dict) -> bool:
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            # make room for the sentinel, the client resyncs with /tickets/changes
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            self.dropped = True
+            return False
+
+
+class Hub:
+    """
+    In-process fan-out project_id -> subscribers. Lives on the event loop;
+    threads (sync routes, session events) hand messages over with publish_threadsafe.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.published = 0
+        self.dropped = 0
+        self._subs: dict[int, set[Subscriber]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._relay: Optional[asyncio.Task] = None
+
+    def subscribe(self, project_id: int) -> Subscriber:
+        sub = Subscriber(project_id, self.queue_size)
+        self._subs.setdefault(project_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        subs = self._subs.get(sub.project_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subs[sub.project_id]
+
+    def publish(self, project_id: int, message: dict) -> None:
+        self.published += 1
+        for sub in list(self._subs.get(project_id, ())):
+            if not sub.offer(message):
+                self.dropped += 1
+                self.unsubscribe(sub)
+
+    def broadcast(self, message: dict) -> None:
+        for project_id in list(self._subs):
+            self.publish(project_id, message)
+
+    def publish_threadsafe(self, project_id: int, message: dict) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return  # not serving (cli commands), nobody to tell
+        self._loop.call_soon_threadsafe(self.publish, project_id, message)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if USE_PG_NOTIFY:
+            self._relay = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._relay is not None:
+            self._relay.cancel()
+            try:
+                await self._relay
+            except asyncio.CancelledError:
+                pass
+        self._loop = None
+
+    def stats(self) -> dict:
+        return {
+            "projects": len(self._subs),
+            "connections": sum(len(s) for s in self._subs.values()),
+            "published": self.published,
+            "dropped_slow": self.dropped,
+        }
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        envelope = json.loads(payload)
+        self.publish(envelope["p"], envelope["m"])
+
+    async def _listen(self) -> None:
+        import asyncpg  # only needed with postgres
+
+        dsn = make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        first = True
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(REALTIME_CHANNEL, self._on_notify)
+                if not first:
+                    # notifications sent while we were away are gone
+                    self.broadcast({"type": "resync"})
+                first = False
+                await lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Realtime LISTEN connection failed: %s", e)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(REALTIME_RECONNECT_SECONDS)
+
+
+hub = Hub(REALTIME_QUEUE_SIZE)
+
+
+# called inside a write transaction; delivered only if it commits
+def queue_messages(db: Session, items: Iterable[tuple[int, dict]]) -> None:
+    db.info.setdefault(_OUTBOX, []).extend(items)
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _notify_in_transaction(session):
+    # NOTIFY is transactional: postgres delivers it on commit, never on rollback
+    if not USE_PG_NOTIFY:
+        return
+    items = session.info.get(_OUTBOX)
+    if not items:
+        return
+    payloads = [
+        json.dumps({"p": project_id, "m": message}, separators=(",", ":"), default=str)
+        for project_id, message in items
+    ]
+    session.execute(_NOTIFY_ALL, {"channel": REALTIME_CHANNEL, "payloads": payloads})
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _publish_after_commit(session):
+    items = session.info.pop(_OUTBOX, None)
+    if items and not USE_PG_NOTIFY:
+        for project_id, message in items:
+            hub.publish_threadsafe(project_id, message)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_outbox(session):
+    session.info.pop(_OUTBOX, None)
@@ -3,11 +3,10 @@ import os
 import re
 import json
 import logging
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from fastapi import HTTPException
 from dotenv import load_dotenv
-import google.generativeai as genai
-from google.generativeai import GenerativeModel
 from sqlalchemy.orm import Session
 
 from tickets.repository.ai_memory import get_history, save_message
@@ -21,7 +20,6 @@ from tickets.repository.prompts import (
 from tickets.routers.analytics import compute_team_metrics
 
 load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
 logger = logging.getLogger(__name__)
 _TEAM_RE    = re.compile(r"\bteam\s*[-:]\s*([A-Za-z0-9_-]+)", re.I)
@@ -38,6 +36,18 @@ _JSON_SCHEMA = """
 }
 """
 
+# google.generativeai is slow to import, configure it on the first chat request
+@lru_cache(maxsize=1)
+def _genai():
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return genai
+
+
+def _model(model_name: str = "gemini-1.5-flash"):
+    return _genai().GenerativeModel(model_name)
+
+
 def _extract_json(text: str) -> str | None:
     m = _JSON_RE.search(text)
     return m.group(0) if m else None
@@ -105,7 +115,7 @@ def analyze_tasks(
     msgs.insert(0, {"role": "user", "parts": [system_prompt]})
 
     # 3) вызываем модель
-    model = GenerativeModel("gemini-1.5-flash")
+    model = _model()
     raw = model.generate_content(msgs).text.strip()
 
     # 4) парсим JSON
@@ -152,7 +162,7 @@ def generate_reply(
     msgs = _history_to_messages(db, session_id, user_input, user_id)
     msgs.insert(0, {"role": "user", "parts": [system_prompt]})
 
-    model = GenerativeModel("gemini-1.5-flash")
+    model = _model()
     reply = model.generate_content(msgs).text.strip()
     if any(
         kw in user_input.lower()
@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from tickets.models import User, ProjectUser
+from tickets.schemas.user import UserBrief
+
+NAME_INDEX_TTL_SECONDS = int(os.getenv("NAME_INDEX_TTL_SECONDS", "300"))
+NAME_INDEX_MAX_PROJECTS = int(os.getenv("NAME_INDEX_MAX_PROJECTS", "1000"))
+NAME_MIN_SIMILARITY = float(os.getenv("NAME_MIN_SIMILARITY", "0.3"))
+
+# match tiers, lower is better
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+
+
+def _norm(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    # same shape as pg_trgm: every word padded with two spaces in front, one behind
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _edit_distance(a: str, b: str) -> int:
+    # levenshtein with adjacent transpositions, "alcie" -> "alice" is 1
+    prev2: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    user_id: int
+    name: str
+    tier: int
+    similarity: float
+
+
+@dataclass(frozen=True)
+class NameResolution:
+    """`user` when the name picks one member; otherwise the matches that did not."""
+    user: Optional[UserBrief]
+    ambiguous: bool
+    candidates: List[NameMatch]
+
+
+class ProjectNameIndex:
+    """
+    Exact, prefix and trigram lookups over the names of one project's members.
+    Built once from a single query, lookups never touch the db.
+    """
+
+    def __init__(self, members: list[tuple[int, str]]):
+        # sorted by (normalized name, id) so every tie breaks the same way
+        self._members = sorted(((_norm(name), uid, name) for uid, name in members))
+        self._names = [key for key, _, _ in self._members]
+        words = sorted(
+            (word, pos)
+            for pos, (key, _, _) in enumerate(self._members)
+            for word in set(key.split())
+        )
+        self._words = [word for word, _ in words]
+        self._word_pos = [pos for _, pos in words]
+        self._grams = [_trigrams(key) for key in self._names]
+        self._postings: dict[str, list[int]] = {}
+        for pos, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def _prefix_range(self, keys: list[str], prefix: str) -> range:
+        # prefix + U+10FFFF sorts after every string that starts with prefix
+        return range(bisect_left(keys, prefix), bisect_left(keys, prefix + "\U0010ffff"))
+
+    def _typos(self, q: str, pos: int, max_typos: int) -> int:
+        # against the whole name and each word, so "smtih" still finds "John Smith"
+        key = self._names[pos]
+        parts = [part for part in [key, *key.split()] if abs(len(part) - len(q)) <= max_typos]
+        return min((_edit_distance(q, part) for part in parts), default=max_typos + 1)
+
+    def lookup(self, query: str, limit: int = 5) -> List[NameMatch]:
+        q = _norm(query)
+        if not q:
+            return []
+        # pos -> (tier, typos, similarity)
+        best: dict[int, tuple[int, int, float]] = {}
+
+        def offer(pos: int, tier: int, typos: int, similarity: float) -> None:
+            rank = (tier, typos, -similarity)
+            if pos not in best or rank < (best[pos][0], best[pos][1], -best[pos][2]):
+                best[pos] = (tier, typos, similarity)
+
+        for pos in self._prefix_range(self._names, q):
+            offer(pos, EXACT if self._names[pos] == q else PREFIX, 0, 1.0)
+        for i in self._prefix_range(self._words, q):
+            offer(self._word_pos[i], WORD_PREFIX, 0, 1.0)
+
+        # fuzzy candidates are only names sharing at least one trigram
+        max_typos = max(1, len(q) // 4)
+        q_grams = _trigrams(q)
+        shared = Counter(pos for gram in q_grams for pos in self._postings.get(gram, ()))
+        for pos, common in shared.items():
+            similarity = common / (len(q_grams) + len(self._grams[pos]) - common)
+            if q in self._names[pos]:
+                offer(pos, SUBSTRING, 0, similarity)
+                continue
+            if similarity < NAME_MIN_SIMILARITY and common < min(2, len(q) // 3):
+                continue
+            typos = self._typos(q, pos, max_typos)
+            if similarity >= NAME_MIN_SIMILARITY or typos <= max_typos:
+                offer(pos, FUZZY, typos, similarity)
+
+        ranked = sorted(best.items(), key=lambda item: (item[1][0], item[1][1], -item[1][2], item[0]))
+        return [
+            NameMatch(
+                user_id=self._members[pos][1],
+                name=self._members[pos][2],
+                tier=tier,
+                similarity=round(similarity, 3),
+            )
+            for pos, (tier, _, similarity) in ranked[:limit]
+        ]
+
+
+class NameIndexRegistry:
+    """
+    project_id -> ProjectNameIndex, rebuilt after ttl or when membership changes.
+    Other workers only see a change after their ttl runs out.
+    """
+
+    def __init__(self, ttl_seconds: int, max_projects: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_projects = max_projects
+        self._entries: "OrderedDict[int, tuple[ProjectNameIndex, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, project_id: int) -> ProjectNameIndex:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(project_id)
+                return entry[0]
+
+        rows = (
+            db.query(User.id, User.name)
+              .join(ProjectUser, ProjectUser.user_id == User.id)
+              .filter(ProjectUser.project_id == project_id)
+              .all()
+        )
+        index = ProjectNameIndex([(row.id, row.name) for row in rows])
+        with self._lock:
+            self._entries[project_id] = (index, now + self.ttl_seconds)
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self.max_projects:
+                self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, project_id: int) -> None:
+        with self._lock:
+            self._entries.pop(project_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def candidates(self, db: Session, project_id: int, name: str, limit: int = 5) -> List[NameMatch]:
+        return self.get(db, project_id).lookup(name, limit)
+
+    def resolve(self, db: Session, project_id: int, name: str, limit: int = 5) -> NameResolution:
+        """
+        Picks a member only on the one exact match, else the one (word) prefix match.
+        Several of either are ambiguous; substring and typo matches are never picked,
+        they only come back as candidates to suggest.
+        """
+        matches = self.candidates(db, project_id, name, limit=limit)
+        for tiers in ((EXACT,), (PREFIX, WORD_PREFIX)):
+            tied = [m for m in matches if m.tier in tiers]
+            if len(tied) == 1:
+                return NameResolution(UserBrief(id=tied[0].user_id, name=tied[0].name), False, tied)
+            if tied:
+                return NameResolution(None, True, tied)
+        return NameResolution(None, False, matches)
+
+
+name_index = NameIndexRegistry(NAME_INDEX_TTL_SECONDS, NAME_INDEX_MAX_PROJECTS)
@@ -1,11 +1,15 @@
 from typing import List, Optional
 from fastapi import HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from tickets.schemas.user import UserBrief
 from tickets.models import Project, ProjectUser, User, UserTeam
 from tickets.schemas.project import ProjectCreate
 from tickets.enums import ProjectRole
+from tickets.oauth2 import principal_cache
+from tickets import realtime
+from tickets.repository.name_index import name_index
 
 #---------------- helper
 def ensure_users_in_team(
@@ -54,6 +58,8 @@ def create_project(
     )
     db.add(association)
     db.commit()
+    principal_cache.invalidate_user(user_id)
+    name_index.invalidate(proj.id)
 
     db.refresh(proj)
     return proj
@@ -66,6 +72,15 @@ def get_projects_by_team(
 ) -> List[Project]:
     return db.query(Project).filter(Project.team_id == team_id).all()
 
+# projects are never edited, so count + max id changes whenever the list does
+def team_projects_watermark(db: Session, team_id: int) -> tuple[int, int]:
+    count, max_id = (
+        db.query(func.count(Project.id), func.max(Project.id))
+          .filter(Project.team_id == team_id)
+          .one()
+    )
+    return count, max_id or 0
+
 def get_project_by_id(
     db: Session,
     project_id: int
@@ -79,15 +94,31 @@ def get_project_by_id(
     return proj
 
 
-def get_users_in_project(db: Session, project_id: int, current_user_id: int) -> List[UserBrief]:
+# ?fields= on the project list, in ProjectOut order
+PROJECT_FIELDS = ("id", "name", "description", "team_id", "created_by", "created_at")
+
+def get_project_rows(
+    db: Session,
+    team_id: int,
+    fields: Optional[tuple[str, ...]] = None,
+) -> List[dict]:
+    # only the requested columns are selected
+    columns = [getattr(Project, name) for name in fields or PROJECT_FIELDS]
+    rows = db.execute(select(*columns).where(Project.team_id == team_id)).all()
+    return [dict(r._mapping) for r in rows]
+
+def _ensure_project_visible(db: Session, project_id: int, current_user_id: int) -> None:
     # проверяем, что current_user состоит в команде проекта
-    proj = db.query(Project).filter(Project.id == project_id).first()
-    if not proj:
+    team_id = db.query(Project.team_id).filter(Project.id == project_id).scalar()
+    if team_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project {project_id} not found"
         )
-    ensure_users_in_team(db, proj.team_id, [current_user_id])
+    ensure_users_in_team(db, team_id, [current_user_id])
+
+def get_users_in_project(db: Session, project_id: int, current_user_id: int) -> List[UserBrief]:
+    _ensure_project_visible(db, project_id, current_user_id)
     users = (
         db.query(User)
           .join(ProjectUser, User.id == ProjectUser.user_id)
@@ -96,6 +127,23 @@ def get_users_in_project(db: Session, project_id: int, current_user_id: int) ->
     )
     return [UserBrief.model_validate(u) for u in users]
 
+# ?fields= on the member list; without it the route keeps returning UserBrief
+MEMBER_FIELDS = ("id", "name", "is_available")
+
+def get_project_member_rows(
+    db: Session,
+    project_id: int,
+    current_user_id: int,
+    fields: tuple[str, ...],
+) -> List[dict]:
+    _ensure_project_visible(db, project_id, current_user_id)
+    rows = db.execute(
+        select(*(getattr(User, name) for name in fields))
+          .join(ProjectUser, ProjectUser.user_id == User.id)
+          .where(ProjectUser.project_id == project_id)
+    ).all()
+    return [dict(r._mapping) for r in rows]
+
 def get_projects_for_user(
     db: Session,
     user_id: int
@@ -138,6 +186,8 @@ def add_user_to_project(
             status_code=status.HTTP_409_CONFLICT,
             detail="User already in project"
         )
+    principal_cache.invalidate_user(user_id)
+    name_index.invalidate(project_id)
 
 def remove_user_from_project(
     db: Session,
@@ -158,4 +208,25 @@ def remove_user_from_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not in this project"
         )
+    queue_member_removed(db, user_id, [project_id])
     db.commit()
+    principal_cache.invalidate_user(user_id)
+    name_index.invalidate(project_id)
+
+
+def queue_member_removed(db: Session, user_id: int, project_ids: List[int]) -> None:
+    # open websockets of the user on these projects close on it, see routers/realtime.py;
+    # called inside the removing transaction, sent only if it commits
+    message = {"type": "member_removed", "user_id": user_id}
+    realtime.queue_messages(db, [(project_id, message) for project_id in project_ids])
+
+
+def team_project_ids(db: Session, team_id: int, user_id: int) -> List[int]:
+    """Projects of the team the user is a member of."""
+    return [
+        project_id for (project_id,) in (
+            db.query(ProjectUser.project_id)
+              .join(Project, Project.id == ProjectUser.project_id)
+              .filter(ProjectUser.user_id == user_id, Project.team_id == team_id)
+        )
+    ]
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from tickets.models import WorkerTeam, Project, User, UserTeam, WorkerTeamMember
 from tickets.enums import WorkerRole
 from tickets.repository.project import ensure_users_in_team
+from tickets.oauth2 import principal_cache
 
 # CREATE WORKER TEAM
 
@@ -34,6 +35,7 @@ def create_worker_team(
     )
     db.add(admin_link)
     db.commit()
+    principal_cache.invalidate_user(admin_id)
     return wt
 
 # ASSIGN LOGIC
@@ -108,6 +110,7 @@ def add_member_to_worker_team(
     link = WorkerTeamMember(worker_team_id=worker_team_id, user_id=user_id)
     db.add(link)
     db.commit()
+    principal_cache.invalidate_user(user_id)
     db.refresh(link)
     return link
 
@@ -136,6 +139,7 @@ def remove_user_from_worker_team(
             detail="User not in this worker_team"
         )
     db.commit()
+    principal_cache.invalidate_user(user_id)
 
 # LIST & GET LOGICS (без изменений)
 
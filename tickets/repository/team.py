@@ -7,6 +7,8 @@ from tickets.enums import *
 from tickets.models import UserTeam
 from tickets.schemas.team import TeamCreate
 from tickets.schemas.team import TeamBriefInfo
+from tickets.oauth2 import principal_cache
+from tickets.repository.project import queue_member_removed, team_project_ids
 
 #helper
 def _raise_not_found() -> None:
@@ -35,6 +37,7 @@ def create_team(db: Session,creator: models.User,payload: TeamCreate) -> models.
     )
     db.add(association)
     db.commit()
+    principal_cache.invalidate_user(creator.id)
     db.refresh(team)
     return team
 
@@ -71,6 +74,7 @@ def join_team(db: Session,user: models.User,code: str) -> models.Team:
         association = UserTeam(user_id=user.id,team_id=team.id,role=TeamRole.member)
         db.add(association)
         db.commit()
+        principal_cache.invalidate_user(user.id)
     db.refresh(team)
     return team
 
@@ -83,8 +87,10 @@ def leave_team(db: Session,user: models.User,team_id: int) -> None:
             detail="You are not in this team."
         )
 
+    queue_member_removed(db, user.id, team_project_ids(db, team_id, user.id))
     user.teams.remove(team)
     db.commit()
+    principal_cache.invalidate_user(user.id)
 
 
 def list_team_members(
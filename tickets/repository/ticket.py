@@ -1,33 +1,96 @@
+import base64
+import binascii
 from typing import List, Optional
 from datetime import datetime, timezone
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, tuple_, insert, update as update_stmt, delete, select
+from sqlalchemy.orm import Session, joinedload, aliased
 from tickets import models
 from tickets.models import UserTeam, ProjectUser
-from tickets.schemas.ticket import TicketCreate, TicketOut, TicketStatusUpdate, TicketAssigneeUpdate, TicketFeedbackUpdate
-from tickets.enums import ProjectRole, TicketType, TicketStatus, WorkerRole
+from tickets.schemas.ticket import (
+    TicketCreate, TicketOut, TicketStatusUpdate, TicketAssigneeUpdate, TicketFeedbackUpdate, TicketFilter,
+    TicketBatchOperation, TicketBatchResult, TicketChanges,
+)
+from tickets.schemas.user import UserBrief
+from tickets.schemas.worker_team import WorkerTeamBrief
+from tickets.enums import ProjectRole, TicketType, TicketStatus, WorkerRole, TicketEventKind
+from tickets.auth_context import AuthContext
+from tickets.repository.name_index import name_index
+from tickets.repository import ticket_search
+from tickets.repository.ticket_counts import record_transitions
+from tickets.repository.workload import workload_index, PROJECT, WORKER_TEAM
+from tickets.repository.ticket_event import event_row, record_event, record_events, events_after, sync_position
 
 #--------------------------------------- CREATE
 def _resolve_assignee(
     db: Session,
     assignee_name: Optional[str],
     project_id: int,
-) -> Optional[int]:
+) -> Optional[UserBrief]:
     if not assignee_name:
         return None
 
-    user = (
-        db.query(models.User)
+    resolution = name_index.resolve(db, project_id, assignee_name)
+    if resolution.user is not None:
+        return resolution.user
+    listed = ", ".join(f"{m.name} (id {m.user_id})" for m in resolution.candidates)
+    if resolution.ambiguous:
+        raise HTTPException(409, f"Assignee '{assignee_name}' matches several project members: {listed}")
+    if listed:
+        raise HTTPException(404, f"Assignee '{assignee_name}' not found in this project, closest: {listed}")
+    raise HTTPException(404, f"Assignee '{assignee_name}' not found in this project")
+
+def _resolve_worker_team(ticket_in: TicketCreate, project_worker_team_id: Optional[int]) -> Optional[int]:
+    if getattr(ticket_in, "worker_team_id", None) is not None:
+        if project_worker_team_id != ticket_in.worker_team_id:
+            raise HTTPException(400, "Worker team not assigned to this project")
+        return ticket_in.worker_team_id
+    if ticket_in.type == TicketType.worker:
+        if not project_worker_team_id:
+            raise HTTPException(400, "No worker team assigned to project")
+        return project_worker_team_id
+    return None
+
+def _auto_assignee(
+    db: Session,
+    team_id: int,
+    project_id: int,
+    worker_team_id: Optional[int],
+) -> Optional[UserBrief]:
+    # same people a project admin may reassign to: available members of the project
+    members = (
+        db.query(models.User.id, models.User.name)
           .join(ProjectUser, ProjectUser.user_id == models.User.id)
           .filter(
               ProjectUser.project_id == project_id,
-              models.User.name.ilike(f"%{assignee_name}%"),
+              ProjectUser.role == ProjectRole.member,
+              models.User.is_available.is_(True),
           )
-          .first()
+          .all()
+    )
+    names = {row.id: row.name for row in members}
+    # worker tickets weigh the load across the whole worker team, not just this project
+    scope, scope_id = (WORKER_TEAM, worker_team_id) if worker_team_id else (PROJECT, project_id)
+    picked = workload_index.least_loaded(db, team_id, scope, scope_id, names, k=1)
+    return UserBrief(id=picked[0], name=names[picked[0]]) if picked else None
+
+def _creation_context(db: Session, project_id: int, user_id: int):
+    # project, author membership and the project's worker team in one round-trip
+    return (
+        db.query(
+            models.Project.team_id,
+            models.Project.worker_team_id,
+            ProjectUser.user_id.label("member_id"),
+            models.User.name.label("author_name"),
+            models.WorkerTeam.name.label("worker_team_name"),
+            models.WorkerTeam.team_id.label("worker_team_team_id"),
+        )
+        .outerjoin(ProjectUser, and_(ProjectUser.project_id == models.Project.id, ProjectUser.user_id == user_id))
+        .outerjoin(models.User, models.User.id == ProjectUser.user_id)
+        .outerjoin(models.WorkerTeam, models.WorkerTeam.id == models.Project.worker_team_id)
+        .filter(models.Project.id == project_id)
+        .first()
     )
-    if not user:
-        raise HTTPException(404, "Assignee not found in this project")
-    return user.id
 
 def create_ticket(
     db: Session,
@@ -36,60 +99,76 @@ def create_ticket(
     project_id: int,
     team_id: int | None = None
 ) -> TicketOut:
-    team_id = team_id or ticket_in.team_id
-    if team_id is None:
-        user: models.User = db.get(models.User, user_id)
-        if not user.teams:
-            raise HTTPException(400, "Team ID must be provided")
-        team_id = user.teams[0].id
-
-    team = db.get(models.Team, team_id)
-    if not team:
-        raise HTTPException(404, "Team not found")
-    project = db.get(models.Project, project_id)
-    if not project:
+    ctx = _creation_context(db, project_id, user_id)
+    if ctx is None:
         raise HTTPException(404, "Project not found")
-
-    author_link = (
-        db.query(ProjectUser)
-        .filter_by(user_id=user_id, project_id=project_id)
-        .first()
-    )
-    if not author_link:
+    team_id = team_id or ticket_in.team_id or ctx.team_id
+    if team_id != ctx.team_id:
+        raise HTTPException(400, "Project does not belong to this team")
+    if ctx.member_id is None:
         raise HTTPException(403, "You are not a member of this project")
 
-    assigned_user_id = _resolve_assignee(
+    assignee = _resolve_assignee(
         db,
         getattr(ticket_in, "assigned_to_name", None),  # поле-строка из схемы
         project_id,
     )
+    assigned_worker_team_id = _resolve_worker_team(ticket_in, ctx.worker_team_id)
+    if assignee is None and ticket_in.auto_assign:
+        assignee = _auto_assignee(db, team_id, project_id, assigned_worker_team_id)
 
-    assigned_worker_team_id: Optional[int] = None
-    if getattr(ticket_in, "worker_team_id", None) is not None:
-        if project.worker_team_id != ticket_in.worker_team_id:
-            raise HTTPException(400, "Worker team not assigned to this project")
-        assigned_worker_team_id = ticket_in.worker_team_id
-    elif ticket_in.type == TicketType.worker:
-        if not project.worker_team_id:
-            raise HTTPException(400, "No worker team assigned to project")
-        assigned_worker_team_id = project.worker_team_id
+    now = datetime.now(timezone.utc)
+    ticket_id = db.execute(
+        insert(models.Ticket)
+          .values(
+              title=ticket_in.title,
+              description=ticket_in.description,
+              type=ticket_in.type,
+              priority=ticket_in.priority,
+              status=TicketStatus.open,
+              confirmed=False,
+              created_by=user_id,
+              assigned_to=assignee.id if assignee else None,
+              worker_team_id=assigned_worker_team_id,
+              team_id=team_id,
+              project_id=project_id,
+              created_at=now,
+              updated_at=now,
+          )
+          .returning(models.Ticket.id)
+    ).scalar_one()
+    record_event(
+        db, TicketEventKind.created, ticket_id, project_id, team_id, user_id,
+        status=TicketStatus.open,
+        assigned_to=assignee.id if assignee else None,
+        worker_team_id=assigned_worker_team_id,
+        priority=ticket_in.priority,
+        type=ticket_in.type,
+    )
+    record_transitions(db, [(project_id, None, (TicketStatus.open, assignee.id if assignee else None))])
+    db.commit()
+    ticket_search.index_ticket(project_id, ticket_id, ticket_in.title, ticket_in.description)
 
-    ticket = models.Ticket(
+    # everything TicketOut needs is already known, no reload
+    return TicketOut(
+        id=ticket_id,
         title=ticket_in.title,
         description=ticket_in.description,
         type=ticket_in.type,
+        status=TicketStatus.open,
         priority=ticket_in.priority,
-        created_by=user_id,
-        assigned_to=assigned_user_id,
-        worker_team_id=assigned_worker_team_id,
-        team_id = team.id,
-        project_id=project_id,
+        confirmed=False,
+        feedback=None,
+        version=1,
+        created_at=now.replace(tzinfo=None),  # the column is naive, match what a read returns
+        creator=UserBrief(id=user_id, name=ctx.author_name),
+        assignee=assignee,
+        worker_team=WorkerTeamBrief(
+            id=assigned_worker_team_id,
+            name=ctx.worker_team_name,
+            team_id=ctx.worker_team_team_id,
+        ) if assigned_worker_team_id else None,
     )
-    db.add(ticket)
-    db.commit()
-    db.refresh(ticket)
-
-    return _load_ticket(db, ticket.id)
 
 #------------------------------ GET LOGICS
 
@@ -108,50 +187,278 @@ def get_ticket_by_id(db: Session, ticket_id: int, project_id: int) -> TicketOut:
         raise HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
     return TicketOut.model_validate(ticket)
 
-def get_all_tickets(db: Session, project_id: int) -> List[TicketOut]:
-    tickets = (
-        db.query(models.Ticket)
-          .options(
-              joinedload(models.Ticket.creator),
-              joinedload(models.Ticket.assignee),
-              joinedload(models.Ticket.worker_team),
-          )
-          .filter_by(project_id=project_id)
-          .all()
+# list reads skip the ORM: only the columns TicketOut needs, as plain rows,
+# shaped into TicketOut-compatible dicts and sent with serialization.json_response
+_Creator = aliased(models.User)
+_Assignee = aliased(models.User)
+_T = models.Ticket
+
+# field -> (columns to select, join it needs, builder), in TicketOut order
+_TICKET_FIELDS = {
+    "id":          ((_T.id,), None, lambda r: r.id),
+    "title":       ((_T.title,), None, lambda r: r.title),
+    "description": ((_T.description,), None, lambda r: r.description),
+    "type":        ((_T.type,), None, lambda r: r.type.value),
+    "status":      ((_T.status,), None, lambda r: r.status.value),
+    "creator": (
+        (_T.created_by, _Creator.name.label("creator_name")),
+        (_Creator, _Creator.id == _T.created_by),
+        lambda r: {"id": r.created_by, "name": r.creator_name},
+    ),
+    "worker_team": (
+        (_T.worker_team_id, models.WorkerTeam.name.label("worker_team_name"),
+         models.WorkerTeam.team_id.label("worker_team_team_id")),
+        (models.WorkerTeam, models.WorkerTeam.id == _T.worker_team_id),
+        lambda r: (
+            {"id": r.worker_team_id, "name": r.worker_team_name, "team_id": r.worker_team_team_id}
+            if r.worker_team_id is not None else None
+        ),
+    ),
+    "assignee": (
+        (_T.assigned_to, _Assignee.name.label("assignee_name")),
+        (_Assignee, _Assignee.id == _T.assigned_to),
+        lambda r: {"id": r.assigned_to, "name": r.assignee_name} if r.assigned_to is not None else None,
+    ),
+    "created_at":  ((_T.created_at,), None, lambda r: r.created_at),
+    "priority":    ((_T.priority,), None, lambda r: r.priority.value),
+    "confirmed":   ((_T.confirmed,), None, lambda r: r.confirmed),
+    "feedback":    ((_T.feedback,), None, lambda r: r.feedback),
+    "version":     ((_T.version,), None, lambda r: r.version),
+}
+TICKET_FIELDS = tuple(_TICKET_FIELDS)
+
+def _ticket_rows(fields: Optional[tuple[str, ...]] = None, *extra):
+    """SELECT of just the requested fields (all when None), joining only what they need."""
+    columns, joins = [], []
+    for name in fields or TICKET_FIELDS:
+        cols, join, _ = _TICKET_FIELDS[name]
+        columns.extend(cols)
+        if join is not None:
+            joins.append(join)
+    stmt = select(*columns, *extra).select_from(_T)
+    for target, onclause in joins:
+        stmt = stmt.outerjoin(target, onclause)
+    return stmt
+
+def _ticket_dict(row, fields: Optional[tuple[str, ...]] = None) -> dict:
+    return {name: _TICKET_FIELDS[name][2](row) for name in fields or TICKET_FIELDS}
+
+def _returning_columns() -> tuple:
+    # RETURNING can't join: the related names come from correlated subqueries
+    t, user, wt = models.Ticket, models.User, models.WorkerTeam
+    def related(column, key, label):
+        return select(column).where(key).correlate(t).scalar_subquery().label(label)
+    return (
+        t.id, t.title, t.description, t.type, t.status, t.priority,
+        t.confirmed, t.feedback, t.created_at, t.version, t.team_id,
+        t.created_by, related(user.name, user.id == t.created_by, "creator_name"),
+        t.assigned_to, related(user.name, user.id == t.assigned_to, "assignee_name"),
+        t.worker_team_id,
+        related(wt.name, wt.id == t.worker_team_id, "worker_team_name"),
+        related(wt.team_id, wt.id == t.worker_team_id, "worker_team_team_id"),
     )
-    return [TicketOut.model_validate(t) for t in tickets]
 
-def get_user_tickets(db: Session, user_id, project_id: int) -> List[TicketOut]:
-    tickets = (
-        db.query(models.Ticket)
-          .options(
-              joinedload(models.Ticket.creator),
-              joinedload(models.Ticket.assignee),
-              joinedload(models.Ticket.worker_team),
-          )
-          .filter_by(created_by=user_id, project_id=project_id)
-          .all()
+_NESTED = ("creator", "assignee", "worker_team")
+
+def normalize_tickets(tickets: List[dict]) -> dict:
+    """TicketListNormalized shape: nested objects become ids, each user/worker team listed once."""
+    users: dict[int, dict] = {}
+    worker_teams: dict[int, dict] = {}
+    flat = []
+    for t in tickets:
+        item = {k: v for k, v in t.items() if k not in _NESTED}
+        # with ?fields= some of them may not be there at all
+        if "creator" in t:
+            users[t["creator"]["id"]] = t["creator"]
+            item["creator_id"] = t["creator"]["id"]
+        if "assignee" in t:
+            assignee = t["assignee"]
+            if assignee is not None:
+                users[assignee["id"]] = assignee
+            item["assignee_id"] = assignee["id"] if assignee is not None else None
+        if "worker_team" in t:
+            worker_team = t["worker_team"]
+            if worker_team is not None:
+                worker_teams[worker_team["id"]] = worker_team
+            item["worker_team_id"] = worker_team["id"] if worker_team is not None else None
+        flat.append(item)
+    return {
+        "tickets": flat,
+        "included": {
+            "users": [users[k] for k in sorted(users)],
+            "worker_teams": [worker_teams[k] for k in sorted(worker_teams)],
+        },
+    }
+
+def get_all_tickets(db: Session, project_id: int, fields: Optional[tuple[str, ...]] = None) -> List[dict]:
+    rows = db.execute(_ticket_rows(fields).where(models.Ticket.project_id == project_id)).all()
+    return [_ticket_dict(r, fields) for r in rows]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# opaque cursor = position of the last returned ticket in (created_at, id) order
+def _encode_cursor(created_at: datetime, ticket_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{ticket_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, ticket_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(ticket_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(400, "Invalid cursor")
+
+def _apply_filters(query, filters: TicketFilter):
+    t = models.Ticket
+    if filters.status is not None:
+        query = query.filter(t.status == filters.status)
+    if filters.priority is not None:
+        query = query.filter(t.priority == filters.priority)
+    if filters.type is not None:
+        query = query.filter(t.type == filters.type)
+    if filters.assigned_to is not None:
+        query = query.filter(t.assigned_to == filters.assigned_to)
+    if filters.created_after is not None:
+        query = query.filter(t.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        query = query.filter(t.created_at < filters.created_before)
+    if filters.updated_after is not None:
+        query = query.filter(t.updated_at >= filters.updated_after)
+    if filters.updated_before is not None:
+        query = query.filter(t.updated_at < filters.updated_before)
+    return query
+
+def get_tickets_page(
+    db: Session,
+    project_id: int,
+    filters: TicketFilter,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+    fields: Optional[tuple[str, ...]] = None,
+) -> tuple[List[dict], Optional[str]]:
+    """
+    Newest first, keyset on (created_at, id). Returns the page and the cursor of the next one.
+    limit=None returns every matching ticket and no cursor.
+    """
+    # the cursor needs created_at even when the client did not ask for it
+    query = (
+        _ticket_rows(fields, models.Ticket.created_at.label("cursor_created_at"))
+          .where(models.Ticket.project_id == project_id)
     )
-    return [TicketOut.model_validate(t) for t in tickets]
+    query = _apply_filters(query, filters)
+    if cursor:
+        created_at, ticket_id = _decode_cursor(cursor)
+        query = query.where(tuple_(models.Ticket.created_at, models.Ticket.id) < (created_at, ticket_id))
+    query = query.order_by(models.Ticket.created_at.desc(), models.Ticket.id.desc())
+    if limit is None:
+        return [_ticket_dict(r, fields) for r in db.execute(query).all()], None
+    # one extra row tells whether a next page exists
+    rows = db.execute(query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].cursor_created_at, rows[-1].id)
+    return [_ticket_dict(r, fields) for r in rows], next_cursor
+
+def get_user_tickets(
+    db: Session, user_id, project_id: int, fields: Optional[tuple[str, ...]] = None
+) -> List[dict]:
+    rows = db.execute(
+        _ticket_rows(fields).where(models.Ticket.created_by == user_id, models.Ticket.project_id == project_id)
+    ).all()
+    return [_ticket_dict(r, fields) for r in rows]
 
 def get_tickets_assigned_to_user(
-    db: Session, current_user: models.User, project_id: int
-) -> List[TicketOut]:
-    if not any(pu.project_id == project_id for pu in current_user.project_users):
+    db: Session, auth: AuthContext, project_id: int, fields: Optional[tuple[str, ...]] = None
+) -> List[dict]:
+    if not auth.is_project_member(project_id):
         raise HTTPException(403, "Not a project member")
 
-    tickets = (
-        db.query(models.Ticket)
-          .options(
-              joinedload(models.Ticket.creator),
-              joinedload(models.Ticket.assignee),
-              joinedload(models.Ticket.worker_team),
-          )
-          .filter_by(assigned_to=current_user.id, project_id=project_id)
-          .filter(models.Ticket.status.in_([TicketStatus.open, TicketStatus.in_progress]))
-          .all()
+    rows = db.execute(
+        _ticket_rows(fields).where(
+            models.Ticket.assigned_to == auth.user_id,
+            models.Ticket.project_id == project_id,
+            models.Ticket.status.in_([TicketStatus.open, TicketStatus.in_progress]),
+        )
+    ).all()
+    return [_ticket_dict(r, fields) for r in rows]
+
+#-------------------------------- DELTA SYNC
+SYNC_PAGE_SIZE = 500
+MAX_SYNC_PAGE_SIZE = 2000
+
+# opaque cursor: "<txid>.<event id>" in the event log, plus ".<page cursor>" while a snapshot is paged
+def _sync_cursor(position: tuple[int, int], page: Optional[str] = None) -> str:
+    cursor = f"{position[0]}.{position[1]}"
+    return f"{cursor}.{page}" if page else cursor
+
+def _parse_sync_cursor(cursor: str) -> tuple[tuple[int, int], Optional[str]]:
+    parts = cursor.split(".", 2)
+    try:
+        txid, event_id = int(parts[0]), int(parts[1])
+    except (ValueError, IndexError):
+        raise HTTPException(400, "Invalid cursor")
+    if txid < 0 or event_id < 0:
+        raise HTTPException(400, "Invalid cursor")
+    return (txid, event_id), parts[2] if len(parts) == 3 else None
+
+def _snapshot_page(
+    db: Session, project_id: int, position: tuple[int, int], page: Optional[str], limit: int
+) -> TicketChanges:
+    tickets, next_page = get_tickets_page(db, project_id, TicketFilter(), page, limit)
+    return TicketChanges(
+        cursor=_sync_cursor(position, next_page),
+        tickets=tickets,
+        deleted=[],
+        has_more=next_page is not None,
+        snapshot=True,
+    )
+
+def get_ticket_changes(
+    db: Session,
+    project_id: int,
+    since: Optional[str] = None,
+    limit: int = SYNC_PAGE_SIZE,
+) -> TicketChanges:
+    """
+    Tickets changed after the `since` cursor, read from the event log.
+    Without a cursor pages through every ticket, then continues from the log.
+    """
+    if since is None:
+        # position first: a change landing while the snapshot is paged is sent again after it, never lost
+        return _snapshot_page(db, project_id, sync_position(db, project_id), None, limit)
+
+    position, page = _parse_sync_cursor(since)
+    if page is not None:
+        return _snapshot_page(db, project_id, position, page, limit)
+
+    events = events_after(db, project_id, position, limit + 1)
+    has_more = len(events) > limit
+    events = events[:limit]
+    if not events:
+        return TicketChanges(cursor=_sync_cursor(position), tickets=[], deleted=[], has_more=False)
+
+    # only the last event of each ticket matters, the row holds its current state
+    last_kind: dict[int, int] = {}
+    for e in events:
+        last_kind[e.ticket_id] = e.kind
+    live_ids = [tid for tid, kind in last_kind.items() if kind != TicketEventKind.deleted]
+    found = {}
+    if live_ids:
+        rows = db.execute(
+            _ticket_rows().where(models.Ticket.project_id == project_id, models.Ticket.id.in_(live_ids))
+        ).all()
+        found = {r.id: _ticket_dict(r) for r in rows}
+    # a ticket deleted after this page is already gone, report it now
+    deleted = [tid for tid in last_kind if tid not in found]
+    return TicketChanges(
+        cursor=_sync_cursor((events[-1].txid, events[-1].id)),
+        tickets=[found[tid] for tid in live_ids if tid in found],
+        deleted=deleted,
+        has_more=has_more,
     )
-    return [TicketOut.model_validate(t) for t in tickets]
 
 #-------------------------------- UPDATE LOGIC
 
@@ -162,33 +469,82 @@ ALLOWED_STATUS_TRANSITIONS = {
     "closed": [],
 }
 
-def update_ticket_status_by_assignee(
+# each status has a single way in, so the target status tells what it must be now
+_PREVIOUS_STATUS = {nxt: curr for curr, nexts in ALLOWED_STATUS_TRANSITIONS.items() for nxt in nexts}
+
+def _status_update_failure(
     db: Session,
     ticket_id: int,
     project_id: int,
     update: TicketStatusUpdate,
-    current_user: models.User
-) -> TicketOut:
-    ticket = (
-        db.query(models.Ticket)
+    user_id: int,
+) -> HTTPException:
+    # only runs when the conditional UPDATE matched nothing: tell the client why
+    row = (
+        db.query(models.Ticket.status, models.Ticket.assigned_to, models.Ticket.version)
           .filter_by(id=ticket_id, project_id=project_id)
           .first()
     )
-    if not ticket:
-        raise HTTPException(404, "Ticket not found")
-    if ticket.assigned_to != current_user.id:
-        raise HTTPException(403, "Only assignee can update")
-
-    curr, nxt = ticket.status.value, update.status.value
+    if row is None:
+        return HTTPException(404, "Ticket not found")
+    if row.assigned_to != user_id:
+        return HTTPException(403, "Only assignee can update")
+    if update.expected_version is not None and row.version != update.expected_version:
+        return HTTPException(409, f"Ticket was modified (version {row.version}), reload and retry")
+    curr, nxt = row.status.value, update.status.value
     if nxt not in ALLOWED_STATUS_TRANSITIONS[curr]:
-        raise HTTPException(400, f"Cannot go from {curr} to {nxt}")
+        return HTTPException(400, f"Cannot go from {curr} to {nxt}")
+    # the row matches now, so it changed under us between the UPDATE and this read
+    return HTTPException(409, "Ticket was modified concurrently, retry")
 
-    ticket.status = update.status
-    if update.status.name == "closed":
-        ticket.closed_at = datetime.now(timezone.utc)
-    ticket.updated_at = datetime.now(timezone.utc)
+def update_ticket_status_by_assignee(
+    db: Session,
+    ticket_id: int,
+    project_id: int,
+    update: TicketStatusUpdate,
+    current_user: models.User
+) -> TicketOut:
+    """
+    Compare-and-swap: one UPDATE guarded by assignee, previous status and
+    (if given) expected_version, returning everything TicketOut needs.
+    No read before, no row lock; losing a race gives 409.
+    """
+    nxt = update.status
+    prev = _PREVIOUS_STATUS.get(nxt.value)
+    t = models.Ticket
+    now = datetime.now(timezone.utc)
+    values = {"status": nxt, "version": t.version + 1, "updated_at": now}
+    if nxt == TicketStatus.closed:
+        values["closed_at"] = now
+
+    row = None
+    if prev is not None:
+        stmt = (
+            update_stmt(t)
+              .where(
+                  t.id == ticket_id,
+                  t.project_id == project_id,
+                  t.assigned_to == current_user.id,
+                  t.status == TicketStatus(prev),
+              )
+              .values(**values)
+              .returning(*_returning_columns())
+              .execution_options(synchronize_session=False)
+        )
+        if update.expected_version is not None:
+            stmt = stmt.where(t.version == update.expected_version)
+        row = db.execute(stmt).first()
+    if row is None:
+        db.rollback()
+        raise _status_update_failure(db, ticket_id, project_id, update, current_user.id)
+
+    record_event(
+        db, TicketEventKind.status, ticket_id, project_id, row.team_id, current_user.id,
+        prev_status=prev, status=nxt,
+    )
+    record_transitions(db, [(project_id, (prev, current_user.id), (nxt, current_user.id))])
     db.commit()
-    return _load_ticket(db, ticket.id)
+    return TicketOut.model_validate(_ticket_dict(row))
 
 def leave_feedback_by_creator(
     db: Session,
@@ -212,14 +568,45 @@ def leave_feedback_by_creator(
     ticket.feedback = update.feedback or ticket.feedback
     ticket.confirmed = update.confirmed
     ticket.updated_at = datetime.now(timezone.utc)
+    ticket.version = models.Ticket.version + 1
+    record_event(
+        db, TicketEventKind.feedback, ticket.id, project_id, ticket.team_id, current_user.id,
+        confirmed=update.confirmed,
+    )
     db.commit()
     return _load_ticket(db, ticket.id)
 
+# project roles a ticket can be reassigned to
+_ASSIGNABLE_ROLES = (ProjectRole.member.value, WorkerRole.worker.value)
+
+def _assignee_errors(db: Session, project_id: int, user_ids: set[int]) -> dict[int, HTTPException]:
+    """
+    Why each of `user_ids` can't take the project's tickets; eligible users are absent.
+    The one rule for reassignment, single ticket or batch.
+    """
+    rows = {
+        r.user_id: r
+        for r in (
+            db.query(ProjectUser.user_id, ProjectUser.role, models.User.is_available)
+              .join(models.User, models.User.id == ProjectUser.user_id)
+              .filter(ProjectUser.project_id == project_id, ProjectUser.user_id.in_(user_ids))
+        )
+    }
+    errors = {}
+    for user_id in user_ids:
+        row = rows.get(user_id)
+        if row is None or row.role not in _ASSIGNABLE_ROLES:
+            errors[user_id] = HTTPException(403, "Must be member or worker")
+        elif not row.is_available:
+            errors[user_id] = HTTPException(400, "User not available")
+    return errors
+
 def update_ticket_assignee(
     db: Session,
     ticket_id: int,
     update: TicketAssigneeUpdate,
-    project_id: int
+    project_id: int,
+    actor_id: Optional[int] = None,
 ) -> TicketOut:
     ticket = (
         db.query(models.Ticket)
@@ -228,43 +615,248 @@ def update_ticket_assignee(
     )
     if not ticket:
         raise HTTPException(404, "Ticket not found")
-    # only project-admin may reassign
-    is_admin = (
-        db.query(ProjectUser)
-          .filter_by(
-              user_id=update.assigned_to,
-              project_id=project_id,
-              role=ProjectRole.admin
-          )
-          .first()
-    )
-    if not is_admin:
-        raise HTTPException(403, "Only project admin can reassign")
+    # the caller checked the actor is a project admin
+    error = _assignee_errors(db, project_id, {update.assigned_to}).get(update.assigned_to)
+    if error is not None:
+        raise error
 
-    role_link = (
-        db.query(ProjectUser)
-          .filter_by(user_id=update.assigned_to, project_id=project_id)
-          .first()
+    prev_assigned_to = ticket.assigned_to
+    ticket.assigned_to = update.assigned_to
+    ticket.version = models.Ticket.version + 1
+    record_event(
+        db, TicketEventKind.assignee, ticket.id, project_id, ticket.team_id, actor_id,
+        prev_assigned_to=prev_assigned_to, assigned_to=update.assigned_to,
     )
-    if not role_link or role_link.role not in (
-            ProjectRole.member, WorkerRole.worker
-    ):
-        raise HTTPException(403, "Must be member or worker")
+    record_transitions(db, [(project_id, (ticket.status, prev_assigned_to), (ticket.status, update.assigned_to))])
+    db.commit()
+    return _load_ticket(db, ticket.id)
 
-    user = db.get(models.User, update.assigned_to)
-    if not user or not user.is_available:
-        raise HTTPException(400, "User not available")
+#-------------------------------- BATCH
 
-    ticket.assigned_to = update.assigned_to
+def apply_ticket_batch(
+    db: Session,
+    project_id: int,
+    operations: List[TicketBatchOperation],
+    auth: AuthContext,
+) -> List[TicketBatchResult]:
+    """
+    Validates every operation against the state left by the previous ones,
+    then writes the surviving ones with set-based statements in one transaction.
+    Invalid operations are reported per item and skipped; so are the operations
+    of a ticket another request changed after it was read here (409).
+    """
+    project = db.get(models.Project, project_id)
+    if not project:
+        raise HTTPException(404, "Project not found")
+    is_admin = auth.is_project_admin(project_id)
+    results: List[Optional[TicketBatchResult]] = [None] * len(operations)
+
+    def fail(i: int, code: int, detail: str) -> None:
+        op = operations[i]
+        results[i] = TicketBatchResult(
+            index=i, op=op.op, ok=False, status_code=code,
+            ticket_id=getattr(op, "ticket_id", None), detail=detail,
+        )
+
+    # one SELECT for every ticket the batch touches
+    ticket_ids = {op.ticket_id for op in operations if op.op != "create"}
+    state: dict[int, dict] = {}
+    if ticket_ids:
+        rows = (
+            db.query(
+                models.Ticket.id,
+                models.Ticket.status,
+                models.Ticket.assigned_to,
+                models.Ticket.created_by,
+                models.Ticket.version,
+            )
+              .filter(models.Ticket.project_id == project_id, models.Ticket.id.in_(ticket_ids))
+              .all()
+        )
+        for r in rows:
+            state[r.id] = {
+                "orig_status": r.status.value,
+                "status": r.status.value,
+                "orig_assigned_to": r.assigned_to,
+                "assigned_to": r.assigned_to,
+                "created_by": r.created_by,
+                "version": r.version,
+            }
+
+    # one SELECT for reassign targets, same rule as update_ticket_assignee
+    targets = {op.assigned_to for op in operations if op.op == "reassign"}
+    target_errors = _assignee_errors(db, project_id, targets) if targets else {}
+
+    changed: dict[int, dict] = {}   # ticket_id -> new column values
+    deleted: set[int] = set()
+    creates: list[tuple[int, dict]] = []
+    accepted: dict[int, list[int]] = {}  # ticket_id -> indexes of its valid operations
+    for i, op in enumerate(operations):
+        if op.op == "create":
+            try:
+                values = {
+                    "title": op.title,
+                    "description": op.description,
+                    "type": op.type,
+                    "priority": op.priority,
+                    "created_by": auth.user_id,
+                    "assigned_to": getattr(_resolve_assignee(db, op.assigned_to_name, project_id), "id", None),
+                    "worker_team_id": _resolve_worker_team(op, project.worker_team_id),
+                    "team_id": project.team_id,
+                    "project_id": project_id,
+                }
+            except HTTPException as exc:
+                fail(i, exc.status_code, exc.detail)
+                continue
+            creates.append((i, values))
+            continue
+
+        cur = state.get(op.ticket_id)
+        if cur is None or op.ticket_id in deleted:
+            fail(i, 404, "Ticket not found")
+            continue
+        if op.op == "status":
+            if cur["assigned_to"] != auth.user_id:
+                fail(i, 403, "Only assignee can update")
+                continue
+            curr, nxt = cur["status"], op.status.value
+            if nxt not in ALLOWED_STATUS_TRANSITIONS[curr]:
+                fail(i, 400, f"Cannot go from {curr} to {nxt}")
+                continue
+            cur["status"] = nxt
+            changed.setdefault(op.ticket_id, {})["status"] = nxt
+        elif op.op == "reassign":
+            if not is_admin:
+                fail(i, 403, "Only project admin can reassign")
+                continue
+            if op.assigned_to in target_errors:
+                error = target_errors[op.assigned_to]
+                fail(i, error.status_code, error.detail)
+                continue
+            cur["assigned_to"] = op.assigned_to
+            changed.setdefault(op.ticket_id, {})["assigned_to"] = op.assigned_to
+        else:
+            if not (cur["created_by"] == auth.user_id or is_admin):
+                fail(i, 403, "Not permitted")
+                continue
+            deleted.add(op.ticket_id)
+            changed.pop(op.ticket_id, None)
+        results[i] = TicketBatchResult(index=i, op=op.op, ok=True, status_code=200, ticket_id=op.ticket_id)
+        accepted.setdefault(op.ticket_id, []).append(i)
+
+    def read_versions(ticket_ids) -> list:
+        # sorted, so concurrent batches lock shared tickets in the same order
+        return [(ticket_id, state[ticket_id]["version"]) for ticket_id in sorted(ticket_ids)]
+
+    now = datetime.now(timezone.utc)
+    # tickets ending in the same state share one UPDATE. Rows are matched on the
+    # version read above, like the single-ticket CAS: a ticket changed meanwhile
+    # is left alone and only its own operations fail
+    written: set[int] = set()
+    groups: dict[tuple, list[int]] = {}
+    for ticket_id, values in changed.items():
+        groups.setdefault(tuple(sorted(values.items())), []).append(ticket_id)
+    for items, ids in groups.items():
+        values = dict(items)
+        if "status" in values:
+            values["status"] = TicketStatus(values["status"])
+            if values["status"] == TicketStatus.closed:
+                values["closed_at"] = now
+        values["updated_at"] = now
+        values["version"] = models.Ticket.version + 1
+        written.update(db.execute(
+            update_stmt(models.Ticket)
+              .where(tuple_(models.Ticket.id, models.Ticket.version).in_(read_versions(ids)))
+              .values(**values)
+              .returning(models.Ticket.id)
+              .execution_options(synchronize_session=False)
+        ).scalars())
+    if deleted:
+        written.update(db.execute(
+            delete(models.Ticket)
+              .where(
+                  models.Ticket.project_id == project_id,
+                  tuple_(models.Ticket.id, models.Ticket.version).in_(read_versions(deleted)),
+              )
+              .returning(models.Ticket.id)
+              .execution_options(synchronize_session=False)
+        ).scalars())
+
+    lost = (set(changed) | deleted) - written
+    if lost:
+        current = dict(
+            db.query(models.Ticket.id, models.Ticket.version).filter(models.Ticket.id.in_(lost)).all()
+        )
+        for ticket_id in lost:
+            for i in accepted[ticket_id]:
+                if ticket_id in current:
+                    fail(i, 409, f"Ticket was modified (version {current[ticket_id]}), reload and retry")
+                else:
+                    fail(i, 404, "Ticket not found")
+            changed.pop(ticket_id, None)
+            deleted.discard(ticket_id)
+
+    events = []
+    for ticket_id, values in changed.items():
+        orig = state[ticket_id]
+        if "status" in values:
+            events.append(event_row(
+                TicketEventKind.status, ticket_id, project_id, project.team_id, auth.user_id,
+                prev_status=orig["orig_status"], status=values["status"],
+            ))
+        if "assigned_to" in values:
+            events.append(event_row(
+                TicketEventKind.assignee, ticket_id, project_id, project.team_id, auth.user_id,
+                prev_assigned_to=orig["orig_assigned_to"], assigned_to=values["assigned_to"],
+            ))
+    for ticket_id in deleted:
+        # status/assignee changes of a deleted ticket were dropped above, so the row still has the originals
+        events.append(event_row(
+            TicketEventKind.deleted, ticket_id, project_id, project.team_id, auth.user_id,
+            status=state[ticket_id]["orig_status"], assigned_to=state[ticket_id]["orig_assigned_to"],
+        ))
+
+    if creates:
+        new_ids = db.execute(
+            insert(models.Ticket).returning(models.Ticket.id, sort_by_parameter_order=True),
+            [values for _, values in creates],
+        ).scalars().all()
+        for (i, values), ticket_id in zip(creates, new_ids):
+            results[i] = TicketBatchResult(index=i, op="create", ok=True, status_code=201, ticket_id=ticket_id)
+            events.append(event_row(
+                TicketEventKind.created, ticket_id, project_id, project.team_id, auth.user_id,
+                status=TicketStatus.open,
+                assigned_to=values["assigned_to"],
+                worker_team_id=values["worker_team_id"],
+                priority=values["priority"],
+                type=values["type"],
+            ))
+
+    record_events(db, events)
+    transitions = [
+        (project_id, (state[ticket_id]["orig_status"], state[ticket_id]["orig_assigned_to"]),
+         (state[ticket_id]["status"], state[ticket_id]["assigned_to"]))
+        for ticket_id in changed
+    ]
+    transitions += [
+        (project_id, (state[ticket_id]["orig_status"], state[ticket_id]["orig_assigned_to"]), None)
+        for ticket_id in deleted
+    ]
+    transitions += [(project_id, None, (TicketStatus.open, values["assigned_to"])) for _, values in creates]
+    record_transitions(db, transitions)
     db.commit()
-    return _load_ticket(db, ticket.id)
+    ticket_search.forget_tickets(deleted)
+    if creates:
+        for (_, values), ticket_id in zip(creates, new_ids):
+            ticket_search.index_ticket(project_id, ticket_id, values["title"], values["description"])
+    return results
 
 #-------------------------------- DELETE TICKET
 def delete_ticket(
     db: Session,
     ticket_id: int,
     project_id: int,
-    current_user: models.User,
+    auth: AuthContext,
 ) -> None:
     ticket = (
         db.query(models.Ticket)
@@ -274,16 +866,19 @@ def delete_ticket(
     if not ticket:
         raise HTTPException(404, "Ticket not found")
 
-    is_creator = ticket.created_by == current_user.id
-    is_admin = any(
-        pu.project_id == project_id and pu.role == ProjectRole.admin
-        for pu in current_user.project_users
-    )
-    if not (is_creator or is_admin):
+    is_creator = ticket.created_by == auth.user_id
+    if not (is_creator or auth.is_project_admin(project_id)):
         raise HTTPException(403, "Not permitted")
 
+    # last known state, so consumers can drop the ticket from their counts
+    record_event(
+        db, TicketEventKind.deleted, ticket.id, project_id, ticket.team_id, auth.user_id,
+        status=ticket.status, assigned_to=ticket.assigned_to,
+    )
+    record_transitions(db, [(project_id, (ticket.status, ticket.assigned_to), None)])
     db.delete(ticket)
     db.commit()
+    ticket_search.forget_tickets([ticket_id])
 
 #-------------------------------- HELPER
 def _load_ticket(db: Session, ticket_id: int) -> TicketOut:
@@ -0,0 +1,132 @@
+import logging
+from collections import Counter
+from typing import Iterable, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from tickets import models
+from tickets.database import engine
+from tickets.enums import TicketStatus
+
+if engine.dialect.name == "postgresql":
+    from sqlalchemy.dialects.postgresql import insert as upsert
+else:
+    from sqlalchemy.dialects.sqlite import insert as upsert
+
+logger = logging.getLogger(__name__)
+
+# what a ticket contributes to the counters: (status, assignee); None = no ticket
+TicketState = Optional[tuple[TicketStatus, Optional[int]]]
+
+_PROJECT_KEY = ("project_id", "status")
+_USER_KEY = ("user_id", "project_id", "status")
+
+
+def _deltas(transitions: Iterable[tuple[int, TicketState, TicketState]]) -> tuple[Counter, Counter]:
+    projects: Counter = Counter()
+    users: Counter = Counter()
+    for project_id, before, after in transitions:
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            status, assignee = TicketStatus(state[0]), state[1]
+            projects[(project_id, status)] += sign
+            if assignee is not None:
+                users[(assignee, project_id, status)] += sign
+    return projects, users
+
+
+def _add(db: Session, model, key: tuple[str, ...], deltas: Counter) -> None:
+    # sorted, so two transactions touching the same counters lock them in the same order
+    rows = [dict(zip(key, k), count=n) for k, n in sorted(deltas.items()) if n]
+    if not rows:
+        return
+    stmt = upsert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={"count": model.count + stmt.excluded["count"]},
+    )
+    db.execute(stmt, rows)
+
+
+# only adds to the caller's transaction; the caller commits together with the change
+def record_transitions(db: Session, transitions: Iterable[tuple[int, TicketState, TicketState]]) -> None:
+    """(project_id, state before, state after) per changed ticket."""
+    projects, users = _deltas(transitions)
+    _add(db, models.ProjectTicketCount, _PROJECT_KEY, projects)
+    _add(db, models.UserTicketCount, _USER_KEY, users)
+
+
+def _by_status(rows) -> dict[str, int]:
+    counts = {s.value: 0 for s in TicketStatus}
+    for status, count in rows:
+        counts[status.value] += count
+    return counts
+
+
+def project_counts(db: Session, project_id: int) -> dict[str, int]:
+    rows = (
+        db.query(models.ProjectTicketCount.status, models.ProjectTicketCount.count)
+          .filter(models.ProjectTicketCount.project_id == project_id)
+          .all()
+    )
+    return _by_status(rows)
+
+
+def user_counts_in_project(db: Session, project_id: int) -> dict[int, dict[str, int]]:
+    rows = (
+        db.query(models.UserTicketCount.user_id, models.UserTicketCount.status, models.UserTicketCount.count)
+          .filter(models.UserTicketCount.project_id == project_id)
+          .order_by(models.UserTicketCount.user_id)
+          .all()
+    )
+    grouped: dict[int, list] = {}
+    for user_id, status, count in rows:
+        grouped.setdefault(user_id, []).append((status, count))
+    return {user_id: _by_status(items) for user_id, items in grouped.items()}
+
+
+def _drift(actual: Counter, stored: dict) -> Counter:
+    return Counter({
+        key: actual.get(key, 0) - stored.get(key, 0)
+        for key in set(actual) | set(stored)
+        if actual.get(key, 0) != stored.get(key, 0)
+    })
+
+
+def reconcile(db: Session, repair: bool = True) -> int:
+    """
+    Recounts the tickets table and fixes every counter that disagrees.
+    Returns how many counters were off. On postgres it reads one snapshot, so a
+    ticket written meanwhile makes the repair fail instead of double counting it.
+    """
+    if engine.dialect.name == "postgresql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    t = models.Ticket
+    projects = Counter({
+        (row.project_id, row.status): row.n
+        for row in db.query(t.project_id, t.status, func.count(t.id).label("n")).group_by(t.project_id, t.status)
+    })
+    users = Counter({
+        (row.assigned_to, row.project_id, row.status): row.n
+        for row in (
+            db.query(t.assigned_to, t.project_id, t.status, func.count(t.id).label("n"))
+              .filter(t.assigned_to.isnot(None))
+              .group_by(t.assigned_to, t.project_id, t.status)
+        )
+    })
+    p, u = models.ProjectTicketCount, models.UserTicketCount
+    project_drift = _drift(projects, {(r.project_id, r.status): r.count for r in db.query(p)})
+    user_drift = _drift(users, {(r.user_id, r.project_id, r.status): r.count for r in db.query(u)})
+
+    for table, drift in (("project_ticket_counts", project_drift), ("user_ticket_counts", user_drift)):
+        if drift:
+            logger.warning("%s: %d counters off", table, len(drift))
+        for key, delta in sorted(drift.items()):
+            logger.debug("%s %s off by %+d", table, key, -delta)
+    if repair:
+        _add(db, p, _PROJECT_KEY, project_drift)
+        _add(db, u, _USER_KEY, user_drift)
+        db.commit()
+    else:
+        db.rollback()
+    return len(project_drift) + len(user_drift)
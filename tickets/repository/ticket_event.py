@@ -0,0 +1,165 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, List, Optional
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.orm import Session
+from tickets import models
+from tickets.database import engine
+from tickets import realtime
+from tickets.repository import workload
+from tickets.enums import TicketEventKind
+
+# events are stored with one/two letter keys, expand() gives the names back
+_FIELDS = {
+    "s": "status",
+    "ps": "prev_status",
+    "a": "assigned_to",
+    "pa": "prev_assigned_to",
+    "w": "worker_team_id",
+    "p": "priority",
+    "t": "type",
+    "c": "confirmed",
+}
+_KEYS = {name: key for key, name in _FIELDS.items()}
+
+
+def encode(**fields: Any) -> Optional[dict]:
+    data = {
+        _KEYS[name]: value.value if isinstance(value, Enum) else value
+        for name, value in fields.items()
+        if value is not None
+    }
+    return data or None
+
+
+def expand(data: Optional[dict]) -> dict:
+    return {_FIELDS[key]: value for key, value in (data or {}).items()}
+
+
+def event_row(
+    kind: TicketEventKind,
+    ticket_id: int,
+    project_id: Optional[int],
+    team_id: Optional[int],
+    actor_id: Optional[int],
+    **fields: Any,
+) -> dict:
+    return {
+        "kind": int(kind),
+        "ticket_id": ticket_id,
+        "project_id": project_id,
+        "team_id": team_id,
+        "actor_id": actor_id,
+        "data": encode(**fields),
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def push_message(row: dict) -> dict:
+    return {
+        "type": "ticket",
+        "kind": TicketEventKind(row["kind"]).name,
+        "ticket_id": row["ticket_id"],
+        "actor_id": row["actor_id"],
+        "data": expand(row["data"]),
+    }
+
+
+# the writing transaction's id on postgres, see _commit_horizon
+_TXID = func.txid_current() if engine.dialect.name == "postgresql" else None
+
+
+# only adds to the caller's transaction; the caller commits together with the change
+def record_events(db: Session, rows: List[dict]) -> None:
+    if rows:
+        stmt = insert(models.TicketEvent)
+        if _TXID is not None:
+            stmt = stmt.values(txid=_TXID)
+        db.execute(stmt, rows)
+        messages = [push_message(row) for row in rows]
+        # pushed to websocket subscribers and the workload index once the transaction commits
+        realtime.queue_messages(db, [(row["project_id"], m) for row, m in zip(rows, messages)])
+        workload.queue_events(db, [(row["team_id"], row["project_id"], m) for row, m in zip(rows, messages)])
+
+
+def record_event(
+    db: Session,
+    kind: TicketEventKind,
+    ticket_id: int,
+    project_id: Optional[int],
+    team_id: Optional[int],
+    actor_id: Optional[int],
+    **fields: Any,
+) -> None:
+    record_events(db, [event_row(kind, ticket_id, project_id, team_id, actor_id, **fields)])
+
+
+# event ids are taken at insert but become visible at commit, so a transaction
+# holding a lower id can commit after a higher one is already visible
+WATERMARK_WINDOW = 1000
+
+
+def project_watermark(db: Session, project_id: int) -> tuple[int, int]:
+    """
+    (newest event id, events among the last WATERMARK_WINDOW ids) of the project.
+    Every ticket write appends an event, so this changes exactly when tickets do;
+    the count catches a late commit below the max id and stays a bounded index scan.
+    """
+    max_id = (
+        db.query(func.max(models.TicketEvent.id))
+          .filter(models.TicketEvent.project_id == project_id)
+          .scalar()
+    ) or 0
+    recent = (
+        db.query(func.count(models.TicketEvent.id))
+          .filter(
+              models.TicketEvent.project_id == project_id,
+              models.TicketEvent.id > max_id - WATERMARK_WINDOW,
+          )
+          .scalar()
+    )
+    return max_id, recent
+
+
+# Ids are taken at insert and become visible at commit, so on postgres a reader can see
+# a higher id before a lower one: the id alone is no cursor there. Events carry the
+# writing transaction's txid instead, and a reader stops below the xmin of its own
+# snapshot; every transaction under it has finished, so nothing can still appear
+# behind the cursor. sqlite has one writer at a time, id order is commit order and
+# txid stays 0.
+def _commit_horizon():
+    if engine.dialect.name == "postgresql":
+        return func.txid_snapshot_xmin(func.txid_current_snapshot())
+    return None
+
+
+def _finished(query):
+    horizon = _commit_horizon()
+    return query if horizon is None else query.filter(models.TicketEvent.txid < horizon)
+
+
+def sync_position(db: Session, project_id: int) -> tuple[int, int]:
+    """(txid, id) of the project's last finished event, (0, 0) when there is none."""
+    row = (
+        _finished(
+            db.query(models.TicketEvent.txid, models.TicketEvent.id)
+              .filter(models.TicketEvent.project_id == project_id)
+        )
+        .order_by(models.TicketEvent.txid.desc(), models.TicketEvent.id.desc())
+        .first()
+    )
+    return (row.txid, row.id) if row else (0, 0)
+
+
+# (txid, id, ticket_id, kind) rows after the (txid, id) position, in commit order
+def events_after(db: Session, project_id: int, position: tuple[int, int], limit: int) -> list:
+    e = models.TicketEvent
+    return (
+        _finished(
+            db.query(e.txid, e.id, e.ticket_id, e.kind)
+              .filter(e.project_id == project_id, tuple_(e.txid, e.id) > position)
+        )
+        .order_by(e.txid, e.id)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,161 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Iterable, List
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from tickets import models
+from tickets.database import engine
+from tickets.schemas.ticket import TicketOut
+
+# postgres uses the GIN index on models.ticket_search_document,
+# anything else (sqlite in dev and tests) uses the in-process index below
+USE_PG_FTS = engine.dialect.name == "postgresql"
+
+# same weights ts_rank gives to A (title) and B (description)
+_TITLE_WEIGHT = 1.0
+_DESCRIPTION_WEIGHT = 0.4
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall((text or "").casefold())
+
+
+class InvertedIndex:
+    """
+    term -> {ticket_id: weighted tf} per project, kept current by index_ticket/forget_tickets.
+    A project is loaded from the db on its first search, never rebuilt after that.
+    """
+
+    def __init__(self):
+        self._postings: dict[int, dict[str, dict[int, float]]] = {}
+        self._docs: dict[int, tuple[int, tuple[str, ...]]] = {}  # ticket_id -> (project_id, terms)
+        self._sizes: Counter = Counter()  # project_id -> indexed tickets
+        self._loaded: set[int] = set()
+        self._lock = threading.Lock()
+
+    def upsert(self, project_id: int, ticket_id: int, title: str, description: str) -> None:
+        weights: Counter = Counter()
+        for term in _tokens(title):
+            weights[term] += _TITLE_WEIGHT
+        for term in _tokens(description):
+            weights[term] += _DESCRIPTION_WEIGHT
+        with self._lock:
+            self._remove(ticket_id)
+            postings = self._postings.setdefault(project_id, {})
+            for term, weight in weights.items():
+                postings.setdefault(term, {})[ticket_id] = weight
+            self._docs[ticket_id] = (project_id, tuple(weights))
+            self._sizes[project_id] += 1
+
+    def remove(self, ticket_ids: Iterable[int]) -> None:
+        with self._lock:
+            for ticket_id in ticket_ids:
+                self._remove(ticket_id)
+
+    def is_loaded(self, project_id: int) -> bool:
+        return project_id in self._loaded
+
+    def load(self, project_id: int, rows) -> None:
+        for row in rows:
+            # a ticket indexed while the rows were being read is already newer
+            if row.id not in self._docs:
+                self.upsert(project_id, row.id, row.title, row.description)
+        self._loaded.add(project_id)
+
+    def search(self, project_id: int, q: str, limit: int) -> list[int]:
+        terms = set(_tokens(q))
+        if not terms:
+            return []
+        with self._lock:
+            postings = self._postings.get(project_id, {})
+            matches = [postings.get(term) for term in terms]
+            if not all(matches):
+                return []
+            total = self._sizes[project_id]
+            # every term must match, like websearch_to_tsquery's implicit AND
+            ids = set.intersection(*(set(m) for m in matches))
+            scores = {
+                ticket_id: sum(m[ticket_id] * math.log(1 + total / len(m)) for m in matches)
+                for ticket_id in ids
+            }
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return [ticket_id for ticket_id, _ in ranked[:limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._sizes.clear()
+            self._loaded.clear()
+
+    #caller holds the lock
+    def _remove(self, ticket_id: int) -> None:
+        doc = self._docs.pop(ticket_id, None)
+        if doc is None:
+            return
+        project_id, terms = doc
+        self._sizes[project_id] -= 1
+        postings = self._postings.get(project_id, {})
+        for term in terms:
+            bucket = postings.get(term)
+            if bucket is not None:
+                bucket.pop(ticket_id, None)
+                if not bucket:
+                    del postings[term]
+
+
+inverted_index = InvertedIndex()
+
+
+# called by the write paths after commit; postgres keeps its own index
+def index_ticket(project_id: int, ticket_id: int, title: str, description: str) -> None:
+    if not USE_PG_FTS:
+        inverted_index.upsert(project_id, ticket_id, title, description)
+
+
+def forget_tickets(ticket_ids: Iterable[int]) -> None:
+    if not USE_PG_FTS:
+        inverted_index.remove(ticket_ids)
+
+
+def _ticket_query(db: Session):
+    return (
+        db.query(models.Ticket)
+          .options(
+              joinedload(models.Ticket.creator),
+              joinedload(models.Ticket.assignee),
+              joinedload(models.Ticket.worker_team),
+          )
+    )
+
+
+def search_tickets(db: Session, project_id: int, q: str, limit: int = 20) -> List[TicketOut]:
+    """Tickets of the project whose title/description contain every word of q, best match first."""
+    if USE_PG_FTS:
+        doc = models.ticket_search_document
+        query = func.websearch_to_tsquery(models.SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(doc, query)
+        tickets = (
+            _ticket_query(db)
+              .filter(models.Ticket.project_id == project_id, doc.op("@@")(query))
+              .order_by(rank.desc(), models.Ticket.id.desc())
+              .limit(limit)
+              .all()
+        )
+        return [TicketOut.model_validate(t) for t in tickets]
+
+    if not inverted_index.is_loaded(project_id):
+        rows = (
+            db.query(models.Ticket.id, models.Ticket.title, models.Ticket.description)
+              .filter(models.Ticket.project_id == project_id)
+              .all()
+        )
+        inverted_index.load(project_id, rows)
+    ids = inverted_index.search(project_id, q, limit)
+    if not ids:
+        return []
+    by_id = {t.id: t for t in _ticket_query(db).filter(models.Ticket.id.in_(ids)).all()}
+    return [TicketOut.model_validate(by_id[i]) for i in ids if i in by_id]
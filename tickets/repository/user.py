@@ -1,12 +1,14 @@
 from typing import List, Optional
 from fastapi import HTTPException,status
 from pydantic import EmailStr
-from sqlalchemy import func, select
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from tickets import models
 from tickets.hashing import Hash
 from tickets.schemas.user import UserCreate, UserBrief
 from tickets.models import User, UserTeam, ProjectUser
+from tickets.repository.workload import workload_index, TEAM
 from tickets.enums import *
 
 #--------------------------- GET LOGICS
@@ -52,36 +54,10 @@ def get_available_admin_briefs(db: Session, team_id: int) -> List[UserBrief]:
     return [UserBrief.model_validate(u) for u in unique]
 
 def get_least_loaded_admins(db: Session, team_id: int, limit: int = 5) -> List[models.User]:
-    subq = (
-        db.query(
-            models.Ticket.assigned_to.label("admin_id"),
-            func.count(models.Ticket.id).label("open_count"),
-        )
-        .filter(
-            models.Ticket.team_id == team_id,
-            models.Ticket.status == models.TicketStatus.open,
-        )
-        .group_by(models.Ticket.assigned_to)
-        .subquery()
-    )
-
-    results = (
-        db.query(
-            models.User,
-            func.coalesce(subq.c.open_count, 0).label("open_count"),
-        )
-        .outerjoin(subq, models.User.id == subq.c.admin_id)
-        .join(UserTeam, UserTeam.user_id == models.User.id)
-        .filter(
-            UserTeam.team_id == team_id,
-            UserTeam.role    == TeamRole.admin.value,
-            models.User.is_available.is_(True),
-        )
-        .order_by("open_count")
-        .limit(limit)
-        .all()
-    )
-    return [user for user, _ in results]
+    # ranked by open + in_progress tickets from the workload index, no per-call GROUP BY
+    admins = {u.id: u for u in get_available_admins_in_team(db, team_id)}
+    picked = workload_index.least_loaded(db, team_id, TEAM, team_id, admins, k=limit)
+    return [admins[uid] for uid in picked]
 
 # in team
 def get_available_users_by_role(
@@ -164,10 +140,9 @@ def get_project_memberships_for_user_in_team(
     )
 
 #---------------CREATE LOGICS
-def create_user(db: Session, payload: UserCreate) -> models.User:
-    hashed_pwd = Hash.bcrypt(payload.password)
+async def create_user(db: AsyncSession, payload: UserCreate) -> models.User:
+    hashed_pwd = await Hash.bcrypt(payload.password)
     user = models.User(name=payload.name, password=hashed_pwd)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return user
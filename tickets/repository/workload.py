@@ -0,0 +1,185 @@
+import heapq
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from tickets import models
+from tickets.database import RoutingSession
+from tickets.enums import TicketStatus
+
+# a loaded team is re-read after this long, so writes made by other workers show up
+WORKLOAD_INDEX_TTL_SECONDS = int(os.getenv("WORKLOAD_INDEX_TTL_SECONDS", "60"))
+
+TEAM, PROJECT, WORKER_TEAM = "team", "project", "worker_team"
+
+_OUTBOX = "workload_outbox"
+
+
+@dataclass
+class _Active:
+    team_id: int
+    project_id: int
+    worker_team_id: Optional[int]
+    assignee: Optional[int]
+
+    def scopes(self) -> list[tuple[str, int]]:
+        keys = [(TEAM, self.team_id), (PROJECT, self.project_id)]
+        if self.worker_team_id:
+            keys.append((WORKER_TEAM, self.worker_team_id))
+        return keys
+
+
+class WorkloadIndex:
+    """
+    Open + in_progress tickets per assignee, counted per team, project and worker team.
+    A team is read with one query on first use, then kept current from committed
+    ticket events. Each scope has a min-heap of (load, user_id) with lazy deletion:
+    a changed load pushes a new entry and the outdated one is skipped when popped.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._tickets: dict[int, _Active] = {}
+        self._by_team: dict[int, set[int]] = {}
+        self._counts: dict[tuple[str, int], Counter] = {}
+        self._heaps: dict[tuple[str, int], list] = {}
+        self._expires: dict[int, float] = {}  # team_id -> reload after
+        self._lock = threading.Lock()
+
+    #caller holds the lock
+    def _bump(self, ticket: _Active, delta: int) -> None:
+        if ticket.assignee is None:
+            return
+        uid = ticket.assignee
+        for key in ticket.scopes():
+            counts = self._counts.setdefault(key, Counter())
+            counts[uid] += delta
+            if counts[uid] <= 0:
+                del counts[uid]  # idle users are not in the heap, see least_loaded
+                continue
+            heap = self._heaps.setdefault(key, [])
+            heapq.heappush(heap, (counts[uid], uid))
+            if len(heap) > 2 * len(counts) + 64:
+                # mostly outdated entries, start over from the counts
+                heap[:] = [(load, user_id) for user_id, load in counts.items()]
+                heapq.heapify(heap)
+
+    def _add(self, ticket_id: int, ticket: _Active) -> None:
+        self._drop(ticket_id)
+        self._tickets[ticket_id] = ticket
+        self._by_team.setdefault(ticket.team_id, set()).add(ticket_id)
+        self._bump(ticket, 1)
+
+    def _drop(self, ticket_id: int) -> None:
+        ticket = self._tickets.pop(ticket_id, None)
+        if ticket is not None:
+            self._by_team[ticket.team_id].discard(ticket_id)
+            self._bump(ticket, -1)
+
+    def load(self, db: Session, team_id: int) -> None:
+        rows = (
+            db.query(
+                models.Ticket.id,
+                models.Ticket.project_id,
+                models.Ticket.worker_team_id,
+                models.Ticket.assigned_to,
+            )
+            .filter(models.Ticket.team_id == team_id, models.Ticket.status != TicketStatus.closed)
+            .all()
+        )
+        with self._lock:
+            for ticket_id in list(self._by_team.get(team_id, ())):
+                self._drop(ticket_id)
+            for row in rows:
+                self._add(row.id, _Active(team_id, row.project_id, row.worker_team_id, row.assigned_to))
+            self._expires[team_id] = time.monotonic() + self.ttl_seconds
+
+    def ensure_loaded(self, db: Session, team_id: int) -> None:
+        if self._expires.get(team_id, 0) <= time.monotonic():
+            self.load(db, team_id)
+
+    def apply(self, team_id: int, project_id: int, message: dict) -> None:
+        """One committed event, in the realtime push shape (ticket_event.push_message)."""
+        with self._lock:
+            if team_id not in self._expires:
+                return  # not loaded here, the first lookup reads it from the db
+            kind, ticket_id, data = message["kind"], message["ticket_id"], message["data"]
+            if kind == "created":
+                self._add(ticket_id, _Active(team_id, project_id, data.get("worker_team_id"), data.get("assigned_to")))
+            elif kind == "status" and data.get("status") == TicketStatus.closed.value:
+                self._drop(ticket_id)
+            elif kind == "assignee" and ticket_id in self._tickets:
+                ticket = self._tickets[ticket_id]
+                self._bump(ticket, -1)
+                ticket.assignee = data.get("assigned_to")
+                self._bump(ticket, 1)
+            elif kind == "deleted":
+                self._drop(ticket_id)
+
+    def least_loaded(
+        self,
+        db: Session,
+        team_id: int,
+        scope: str,
+        scope_id: int,
+        candidates: Iterable[int],
+        k: int = 1,
+    ) -> List[int]:
+        """
+        Up to k of `candidates` with the fewest open/in_progress tickets in the scope,
+        ties broken by user id. Users with no tickets come first; the rest are popped
+        off the heap, so only about k valid entries are looked at.
+        """
+        self.ensure_loaded(db, team_id)
+        eligible = set(candidates)
+        key = (scope, scope_id)
+        with self._lock:
+            counts = self._counts.get(key, Counter())
+            picked = heapq.nsmallest(k, (uid for uid in eligible if uid not in counts))
+            heap = self._heaps.get(key, [])
+            kept, seen = [], set()
+            while heap and len(picked) < k:
+                load, uid = heapq.heappop(heap)
+                if counts.get(uid) != load or uid in seen:
+                    continue  # outdated or duplicate, gone for good
+                seen.add(uid)
+                kept.append((load, uid))
+                if uid in eligible:
+                    picked.append(uid)
+            for entry in kept:
+                heapq.heappush(heap, entry)
+        return picked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tickets.clear()
+            self._by_team.clear()
+            self._counts.clear()
+            self._heaps.clear()
+            self._expires.clear()
+
+    def stats(self) -> dict:
+        return {"teams": len(self._expires), "active_tickets": len(self._tickets)}
+
+
+workload_index = WorkloadIndex(WORKLOAD_INDEX_TTL_SECONDS)
+
+
+# called inside a write transaction next to realtime.queue_messages; applied only if it commits
+def queue_events(db: Session, items: Iterable[tuple[int, int, dict]]) -> None:
+    db.info.setdefault(_OUTBOX, []).extend(items)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _apply_after_commit(session):
+    for team_id, project_id, message in session.info.pop(_OUTBOX, None) or ():
+        workload_index.apply(team_id, project_id, message)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_outbox(session):
+    session.info.pop(_OUTBOX, None)
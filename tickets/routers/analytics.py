@@ -1,20 +1,27 @@
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
-import pandas as pd
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models
-from ..database import get_db
+from ..database import get_async_read_db
+
+# pandas costs ~1s of import time, load it on the first analytics call
+if TYPE_CHECKING:
+    import pandas as pd
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
+_TICKET_COLUMNS = ["id", "status", "priority", "created_at", "closed_at", "assignee_id", "assignee_name"]
 
 
-def _query_tickets(team_id: int, db: Session):
-    q = (
-        db.query(
+def _tickets_statement(team_id: int):
+    return (
+        select(
             models.Ticket.id,
             models.Ticket.status.label("status"),
             models.Ticket.priority.label("priority"),
@@ -24,45 +31,70 @@ def _query_tickets(team_id: int, db: Session):
             models.User.name.label("assignee_name"),
         )
         .outerjoin(models.User, models.User.id == models.Ticket.assigned_to)
-        .filter(models.Ticket.team_id == team_id)
+        .where(models.Ticket.team_id == team_id)
     )
-    return pd.read_sql(q.statement, db.bind)
 
 
+def _to_frame(rows) -> "pd.DataFrame":
+    import pandas as pd
 
-def compute_team_metrics(team_id: int, db: Session) -> Dict[str, Any]:
-    team = db.query(models.Team).filter(models.Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    df = pd.DataFrame(rows, columns=_TICKET_COLUMNS)
+    # keep datetime dtype even when a column is all NULL
+    df["created_at"] = pd.to_datetime(df["created_at"])
+    df["closed_at"] = pd.to_datetime(df["closed_at"])
+    return df
 
-    df = _query_tickets(team_id, db)
-    if df.empty:
-        return {
-            "team_id": team_id,
-            "total_tickets": 0,
-            "status_summary": {},
-            "workload": [],
-        }
 
-    status_summary = df["status"].value_counts().sort_index().to_dict()
+def _query_tickets(team_id: int, db: Session) -> "pd.DataFrame":
+    return _to_frame(db.execute(_tickets_statement(team_id)).all())
 
-    total_tickets = len(df)
-    workload_df = (
-        df.groupby(["assignee_id", "assignee_name"])
-        .size()
-        .reset_index(name="count")
+
+async def _on_frame(team_id: int, db: AsyncSession, compute: Callable[["pd.DataFrame"], Any]) -> Any:
+    """
+    Reads the team's tickets on the event loop, then builds the frame and runs
+    `compute` on it in the threadpool: pandas is CPU work and would stall every
+    other request on the worker.
+    """
+    rows = (await db.execute(_tickets_statement(team_id))).all()
+    return await run_in_threadpool(lambda: compute(_to_frame(rows)))
+
+
+# status summary and workload only need counts, so they are GROUP BYs in the db
+# (ix_tickets_team_status_assignee) instead of a frame of every ticket in the team
+def _status_counts_statement(team_id: int):
+    return (
+        select(models.Ticket.status, func.count(models.Ticket.id))
+        .where(models.Ticket.team_id == team_id)
+        .group_by(models.Ticket.status)
     )
-    workload_df["percent"] = (workload_df["count"] / total_tickets * 100).round(0).astype(int)
 
-    workload: List[Dict[str, Any]] = []
-    for row in workload_df.itertuples(index=False):
-        workload.append({
-            "assignee_id": int(row.assignee_id) if pd.notna(row.assignee_id) else None,
-            "assignee_name": row.assignee_name or "Unassigned",
-            "count": int(row.count),
-            "percent": int(row.percent),
-        })
 
+def _workload_statement(team_id: int):
+    # inner join: unassigned tickets are not anyone's workload
+    return (
+        select(models.Ticket.assigned_to, models.User.name, func.count(models.Ticket.id))
+        .join(models.User, models.User.id == models.Ticket.assigned_to)
+        .where(models.Ticket.team_id == team_id)
+        .group_by(models.Ticket.assigned_to, models.User.name)
+        .order_by(models.Ticket.assigned_to, models.User.name)
+    )
+
+
+def _team_metrics(team_id: int, status_rows, workload_rows) -> Dict[str, Any]:
+    total_tickets = sum(count for _, count in status_rows)
+    # a NULL status counts towards the total but has no bucket, same as value_counts
+    known = sorted((status.value, count) for status, count in status_rows if status is not None)
+    status_summary = dict(known)
+    workload = [
+        {
+            "assignee_id": assignee_id,
+            "assignee_name": name,
+            "count": count,
+            # python's round is half-to-even like the pandas version was
+            "percent": int(round(count / total_tickets * 100)),
+        }
+        for assignee_id, name, count in workload_rows
+    ]
     return {
         "team_id": team_id,
         "total_tickets": total_tickets,
@@ -71,9 +103,44 @@ def compute_team_metrics(team_id: int, db: Session) -> Dict[str, Any]:
     }
 
 
+async def _team_metrics_async(team_id: int, db: AsyncSession) -> Dict[str, Any]:
+    status_rows = (await db.execute(_status_counts_statement(team_id))).all()
+    workload_rows = (await db.execute(_workload_statement(team_id))).all()
+    return _team_metrics(team_id, status_rows, workload_rows)
+
+
+def _raise_team_not_found(team_id: int) -> None:
+    raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+
+#---------------- sync entry points, used by the chat bot
+
+def compute_team_metrics(team_id: int, db: Session) -> Dict[str, Any]:
+    team = db.query(models.Team).filter(models.Team.id == team_id).first()
+    if not team:
+        _raise_team_not_found(team_id)
+    return _team_metrics(
+        team_id,
+        db.execute(_status_counts_statement(team_id)).all(),
+        db.execute(_workload_statement(team_id)).all(),
+    )
+
 
 def compute_resolution_metrics(team_id: int, db: Session) -> Dict[str, Any]:
-    df = _query_tickets(team_id, db)
+    return _resolution_metrics(team_id, _query_tickets(team_id, db))
+
+
+def compute_ticket_trend(team_id: int, db: Session, days: int) -> List[Dict[str, Any]]:
+    return _ticket_trend(_query_tickets(team_id, db), days)
+
+
+def compute_sla_metrics(team_id: int, db: Session) -> Dict[str, Any]:
+    return _sla_metrics(team_id, _query_tickets(team_id, db))
+
+#---------------- metrics over an already loaded frame
+
+def _resolution_metrics(team_id: int, df: "pd.DataFrame") -> Dict[str, Any]:
+    import pandas as pd
+
     df = df[(df["status"] == "closed") & pd.notna(df["closed_at"])]
     if df.empty:
         return {"team_id": team_id, "average_hours": None, "median_hours": None, "per_assignee": []}
@@ -108,8 +175,9 @@ def compute_resolution_metrics(team_id: int, db: Session) -> Dict[str, Any]:
 
 
 
-def compute_ticket_trend(team_id: int, db: Session, days: int) -> List[Dict[str, Any]]:
-    df = _query_tickets(team_id, db)
+def _ticket_trend(df: "pd.DataFrame", days: int) -> List[Dict[str, Any]]:
+    import pandas as pd
+
     if df.empty:
         return []
 
@@ -143,8 +211,9 @@ _SLA_THRESHOLDS_HOURS = {
 }
 
 
-def compute_sla_metrics(team_id: int, db: Session) -> Dict[str, Any]:
-    df = _query_tickets(team_id, db)
+def _sla_metrics(team_id: int, df: "pd.DataFrame") -> Dict[str, Any]:
+    import pandas as pd
+
     df = df[(df["status"] == "closed") & pd.notna(df["closed_at"]) & pd.notna(df["priority"])]
     if df.empty:
         return {"team_id": team_id, "sla_compliance": {}}
@@ -156,32 +225,97 @@ def compute_sla_metrics(team_id: int, db: Session) -> Dict[str, Any]:
         subset = df[df["priority"] == pr]
         if subset.empty:
             continue
-        within = (subset["resolution_hours"] <= hours).sum()
+        within = int((subset["resolution_hours"] <= hours).sum())
         total = len(subset)
         percent = round(within / total * 100, 1)
         result[pr] = {"total": total, "within_sla": within, "percent": percent}
 
     return {"team_id": team_id, "sla_compliance": result}
 
+
+def _count_rows(df: "pd.DataFrame") -> tuple[list, list]:
+    # the frame counted into the same rows the GROUP BY statements return, for _team_metrics
+    import pandas as pd
+
+    status_rows = [
+        (status if pd.notna(status) else None, int(count))
+        for status, count in df["status"].value_counts(dropna=False).items()
+    ]
+    # groupby drops NaN keys, like the inner join to users
+    workload_rows = [
+        (int(assignee_id), name, int(count))
+        for (assignee_id, name), count in df.groupby(["assignee_id", "assignee_name"]).size().items()
+    ]
+    return status_rows, workload_rows
+
+#---------------- dashboard: every section from one read of the team's tickets
+
+DASHBOARD_SECTIONS = ("metrics", "resolution", "trend", "sla")
+
+
+def _parse_sections(raw: Optional[str]) -> tuple[str, ...]:
+    if raw is None:
+        return DASHBOARD_SECTIONS
+    requested = {s.strip() for s in raw.split(",") if s.strip()}
+    unknown = requested - set(DASHBOARD_SECTIONS)
+    if unknown:
+        raise HTTPException(400, f"Unknown sections: {', '.join(sorted(unknown))}")
+    return tuple(s for s in DASHBOARD_SECTIONS if s in requested)
+
+
+def _dashboard(team_id: int, df: "pd.DataFrame", sections: tuple[str, ...], days: int) -> Dict[str, Any]:
+    # the frame helpers filter into new frames, so they can all share df
+    result: Dict[str, Any] = {"team_id": team_id}
+    if "metrics" in sections:
+        result["metrics"] = _team_metrics(team_id, *_count_rows(df))
+    if "resolution" in sections:
+        result["resolution"] = _resolution_metrics(team_id, df)
+    if "trend" in sections:
+        result["trend"] = _ticket_trend(df, days)
+    if "sla" in sections:
+        result["sla"] = _sla_metrics(team_id, df)
+    return result
+
 #routers
 @router.get("/teams/{team_id}/metrics", response_model=Dict[str, Any])
-async def team_metrics(team_id: int, db: Session = Depends(get_db)):
-    return compute_team_metrics(team_id, db)
+async def team_metrics(team_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    if await db.get(models.Team, team_id) is None:
+        _raise_team_not_found(team_id)
+    return await _team_metrics_async(team_id, db)
 
 
 @router.get("/teams/{team_id}/resolution-metrics", response_model=Dict[str, Any])
-async def resolution_metrics(team_id: int, db: Session = Depends(get_db)):
-    return compute_resolution_metrics(team_id, db)
+async def resolution_metrics(team_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    return await _on_frame(team_id, db, lambda df: _resolution_metrics(team_id, df))
 
 @router.get("/teams/{team_id}/trend", response_model=List[Dict[str, Any]])
 async def ticket_trend(
     team_id: int,
     days: int = Query(30, ge=1, le=365, description="Период в днях"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return compute_ticket_trend(team_id, db, days)
+    return await _on_frame(team_id, db, lambda df: _ticket_trend(df, days))
 
 
 @router.get("/teams/{team_id}/sla-metrics", response_model=Dict[str, Any])
-async def sla_metrics(team_id: int, db: Session = Depends(get_db)):
-    return compute_sla_metrics(team_id, db)
+async def sla_metrics(team_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    return await _on_frame(team_id, db, lambda df: _sla_metrics(team_id, df))
+
+
+# same sections as /metrics, /resolution-metrics, /trend and /sla-metrics with one ticket scan;
+# metrics alone skip the scan and use the GROUP BYs
+@router.get("/teams/{team_id}/dashboard", response_model=Dict[str, Any])
+async def team_dashboard(
+    team_id: int,
+    sections: Optional[str] = Query(None, description=f"Comma separated, any of: {', '.join(DASHBOARD_SECTIONS)}"),
+    days: int = Query(30, ge=1, le=365, description="Период тренда в днях"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = _parse_sections(sections)
+    if await db.get(models.Team, team_id) is None:
+        _raise_team_not_found(team_id)
+    if selected == ("metrics",):
+        return {"team_id": team_id, "metrics": await _team_metrics_async(team_id, db)}
+    if not selected:
+        return {"team_id": team_id}
+    return await _on_frame(team_id, db, lambda df: _dashboard(team_id, df, selected, days))
@@ -2,15 +2,17 @@ from fastapi import APIRouter, Depends, Request, HTTPException, status, Response
 from starlette.responses import RedirectResponse, JSONResponse
 from authlib.integrations.starlette_client import OAuth
 from starlette.config import Config
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.encoders import jsonable_encoder
 import os
 import logging
-from ..hashing import Hash
+from ..hashing import Hash, HashingBusy
 from tickets.schemas.auth import Login
 from tickets.models import User
 from tickets import models, jwttoken
-from tickets.database import get_db
+from tickets.database import get_db, get_async_db
 from tickets.schemas.user import ShowUser
 from tickets.oauth2 import get_current_user
 from tickets.jwttoken import ACCESS_TOKEN_EXPIRE_MINUTES
@@ -34,33 +36,50 @@ oauth.register(
 )
 
 
+# bcrypt is awaited on its own executor, so a login burst holds no request threads
+async def _hash(call, *args):
+    try:
+        return await call(*args)
+    except HashingBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, retry later",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+
 @router.post("/", tags=["Auth"])
-def login_or_register_via_site(
+async def login_or_register_via_site(
     payload: Login,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    user = db.query(models.User).filter(models.User.name == payload.username).first()
+    user = (await db.execute(select(models.User).where(models.User.name == payload.username))).scalars().first()
     if not user:
         user = models.User(
             name=payload.username,
             email=f"{payload.username}@local",
-            password=Hash.bcrypt(payload.password),
+            password=await _hash(Hash.bcrypt, payload.password),
             is_available=True
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
     else:
-        if not Hash.verify(user.password, payload.password):
+        valid, new_hash = await _hash(Hash.verify_and_update, user.password, payload.password)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="password invalid",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        # stored hash was made with other BCRYPT_ROUNDS
+        if new_hash:
+            user.password = new_hash
+            await db.commit()
 
     token = jwttoken.create_access_token({"sub": str(user.id)})
 
-    user_out = build_user_response(user)
+    # memberships are lazy relationships, loaded inside the session's sync context
+    user_out = await db.run_sync(lambda _: build_user_response(user))
 
     payload = jsonable_encoder(user_out)
 
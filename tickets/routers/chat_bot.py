@@ -8,6 +8,8 @@ from tickets import models
 from tickets.repository.ai_service import analyze_tasks, report_with_metrics, generate_reply
 from tickets.repository.ai_memory import get_or_create_session, save_message
 from tickets.oauth2 import get_current_user
+from tickets.auth_context import AuthContext
+from tickets.routers.dependencies import get_auth_context
 from tickets.repository import ticket as ticket_repository
 from tickets.schemas import ticket as ticket_schema
 from tickets.repository.user import get_least_loaded_admins
@@ -36,7 +38,8 @@ ASSIGN_RE = re.compile(
 def chat(
     req: ChatRequest,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     session_record = get_or_create_session(db, current_user.id)
     session_id = session_record.id
@@ -77,7 +80,7 @@ def chat(
             return ChatResponse(reply=reply, session_id=session_id)
 
         # проверяем, что пользователь состоит в этой команде
-        if team.id not in [t.id for t in current_user.teams]:
+        if not auth.is_team_member(team.id):
             reply = "⚠ Вы не состоите в указанной команде и не можете создавать там тикеты."
             save_message(db, session_id, role="assistant", content=reply)
             return ChatResponse(reply=reply, session_id=session_id)
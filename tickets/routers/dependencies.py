@@ -1,10 +1,12 @@
 from fastapi import Depends, HTTPException, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from tickets.database import get_db
-from tickets.oauth2 import get_current_user
-from tickets.models import User, UserTeam, ProjectUser, Project
-from tickets.enums import TeamRole, ProjectRole, WorkerRole
+from tickets.database import get_db, get_async_read_db, on_primary
+from tickets.oauth2 import get_current_user, get_current_read_user
+from tickets.auth_context import AuthContext, load_auth_context
+from tickets.models import User, Project
+from tickets.enums import WorkerRole
 
 
 async def require_authenticated(
@@ -13,17 +15,41 @@ async def require_authenticated(
     return current_user
 
 
+# fastapi caches dependencies per request, so this query runs once per request.
+# memberships always come from the primary, a lagging replica would grant stale access
+def get_auth_context(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> AuthContext:
+    return on_primary(db, load_auth_context, current_user.id)
+
+
+# same for async read routes, on the route's own AsyncSession
+async def get_read_auth_context(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_read_user),
+) -> AuthContext:
+    return await db.run_sync(on_primary, load_auth_context, current_user.id)
+
+
+async def require_team_member_read(
+    team_id: int = Path(..., ge=1),
+    auth: AuthContext = Depends(get_read_auth_context),
+) -> AuthContext:
+    if not auth.is_team_member(team_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not a member of this team",
+        )
+    return auth
+
+
 async def require_team_member(
     team_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_authenticated),
+    auth: AuthContext = Depends(get_auth_context),
 ) -> User:
-    link = (
-        db.query(UserTeam)
-          .filter_by(team_id=team_id, user_id=current_user.id)
-          .first()
-    )
-    if not link:
+    if not auth.is_team_member(team_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not a member of this team",
@@ -33,15 +59,10 @@ async def require_team_member(
 
 async def require_team_admin(
     team_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_team_member),
+    auth: AuthContext = Depends(get_auth_context),
 ) -> User:
-    link = (
-        db.query(UserTeam)
-          .filter_by(team_id=team_id, user_id=current_user.id)
-          .first()
-    )
-    if link.role != TeamRole.admin.value:
+    if not auth.is_team_admin(team_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Requires team admin role",
@@ -54,20 +75,16 @@ async def require_project_member(
     project_id: int = Path(..., ge=1),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_authenticated),
+    auth: AuthContext = Depends(get_auth_context),
 ) -> User:
-    project = db.query(Project).filter_by(id=project_id, team_id=team_id).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found in this team",
-        )
-
-    link = (
-        db.query(ProjectUser)
-          .filter_by(project_id=project_id, user_id=current_user.id)
-          .first()
-    )
-    if not link:
+    if auth.project_teams.get(project_id) != team_id:
+        # failure path only: tell "no such project" apart from "not a member"
+        project = db.query(Project).filter_by(id=project_id, team_id=team_id).first()
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found in this team",
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not a member of this project",
@@ -78,15 +95,10 @@ async def require_project_member(
 async def require_project_admin(
     team_id: int = Path(..., ge=1),
     project_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_project_member),
+    auth: AuthContext = Depends(get_auth_context),
 ) -> User:
-    link = (
-        db.query(ProjectUser)
-          .filter_by(project_id=project_id, user_id=current_user.id)
-          .first()
-    )
-    if link.role != ProjectRole.admin.value:
+    if not auth.is_project_admin(project_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Requires project admin role",
@@ -97,15 +109,10 @@ async def require_project_admin(
 async def require_project_worker(
     team_id: int = Path(..., ge=1),
     project_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_project_member),
+    auth: AuthContext = Depends(get_auth_context),
 ) -> User:
-    link = (
-        db.query(ProjectUser)
-          .filter_by(project_id=project_id, user_id=current_user.id)
-          .first()
-    )
-    if link.role != WorkerRole.worker.value:
+    if auth.project_role(project_id) != WorkerRole.worker.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Requires project worker role",
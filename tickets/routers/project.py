@@ -1,15 +1,19 @@
-from typing import List
-from fastapi import APIRouter, Depends, Path, Query, status, HTTPException, Response
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Path, Query, Request, status, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from tickets.database import get_db
+from tickets.auth_context import AuthContext
+from tickets.database import get_db, get_async_read_db
 from tickets.repository.project import get_users_in_project
-from tickets.routers.dependencies import require_team_admin, require_team_member
+from tickets.routers.dependencies import require_team_admin, require_team_member_read
 from tickets.schemas.project import ProjectCreate, ProjectOut, ProjectBrief
 from tickets.schemas.user import ShowUser, ShowUserAvailability, UserBrief
 from tickets.repository import project as project_repo
 from tickets.repository import user as user_repo
 from tickets.enums import ProjectRole, TicketType
 from tickets.models import User
+from tickets.etag import not_modified
+from tickets.serialization import json_response, parse_fields
 
 router = APIRouter(
     prefix="/teams/{team_id}/projects",
@@ -34,25 +38,31 @@ def create_project(
     "/",
     response_model=List[ProjectOut],
 )
-def list_projects(
+async def list_projects(
+    request: Request,
+    response: Response,
     team_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    _current_user: User = Depends(require_team_member),
+    fields: Optional[str] = Query(None, description=f"Comma separated subset of: {', '.join(project_repo.PROJECT_FIELDS)}"),
+    db: AsyncSession = Depends(get_async_read_db),
+    _auth: AuthContext = Depends(require_team_member_read),
 ) -> List[ProjectOut]:
-    raws = project_repo.get_projects_by_team(db, team_id)
-    return [ProjectOut.model_validate(p) for p in raws]
+    selected = parse_fields(fields, project_repo.PROJECT_FIELDS)
+    watermark = await db.run_sync(project_repo.team_projects_watermark, team_id)
+    if cached := not_modified(request, response, "projects", team_id, watermark, selected):
+        return cached
+    return json_response(await db.run_sync(project_repo.get_project_rows, team_id, selected), response)
 
 @router.get(
     "/{project_id}",
     response_model=ProjectOut,
 )
-def get_project(
+async def get_project(
     team_id: int = Path(..., ge=1),
     project_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    _current_user: User = Depends(require_team_member),
+    db: AsyncSession = Depends(get_async_read_db),
+    _auth: AuthContext = Depends(require_team_member_read),
 ) -> ProjectOut:
-    raw = project_repo.get_project_by_id(db, project_id)
+    raw = await db.run_sync(project_repo.get_project_by_id, project_id)
     if raw.team_id != team_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -92,26 +102,33 @@ def remove_user_from_project(
     response_model=List[UserBrief],
     status_code=status.HTTP_200_OK
 )
-def list_project_members(
+async def list_project_members(
     project_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    current_user=Depends(require_team_member),
+    fields: Optional[str] = Query(None, description=f"Comma separated subset of: {', '.join(project_repo.MEMBER_FIELDS)}"),
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(require_team_member_read),
 ) -> List[UserBrief]:
-    users = get_users_in_project(db, project_id, current_user.id)
+    if fields is not None:
+        selected = parse_fields(fields, project_repo.MEMBER_FIELDS)
+        return json_response(await db.run_sync(project_repo.get_project_member_rows, project_id, auth.user_id, selected))
+    users = await db.run_sync(get_users_in_project, project_id, auth.user_id)
     return [UserBrief(id=u.id, name=u.name) for u in users]
 
 @router.get(
     "/{project_id}/assignees",
     response_model=List[ShowUserAvailability],
 )
-def list_assignees(
+async def list_assignees(
     project_id: int = Path(..., ge=1),
     ticket_type: TicketType = Query(...),
-    db: Session = Depends(get_db),
-    _current_user: User = Depends(require_team_member),
+    db: AsyncSession = Depends(get_async_read_db),
+    _auth: AuthContext = Depends(require_team_member_read),
 ) -> List[ShowUser]:
-    if ticket_type == TicketType.worker:
-        raws = user_repo.get_available_users_by_role(db, "worker", project_id)
-    else:
-        raws = user_repo.get_project_users_by_role(db, project_id, ProjectRole.member)
-    return [ShowUser.model_validate(u) for u in raws]
+    def load(session: Session) -> List[ShowUser]:
+        # validated here, the relationships load lazily
+        if ticket_type == TicketType.worker:
+            raws = user_repo.get_available_users_by_role(session, "worker", project_id)
+        else:
+            raws = user_repo.get_project_users_by_role(session, project_id, ProjectRole.member)
+        return [ShowUser.model_validate(u) for u in raws]
+    return await db.run_sync(load)
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, WebSocket, status
+from fastapi.concurrency import run_in_threadpool
+from tickets.database import SessionLocal
+from tickets.oauth2 import authenticate_token
+from tickets.auth_context import load_auth_context
+from tickets.realtime import hub
+
+router = APIRouter(tags=["Realtime"])
+
+
+# blocking auth runs in the threadpool with its own short session,
+# so an open socket never holds a db connection
+def _authorize(token: str, project_id: int) -> Optional[int]:
+    """The user id when the token belongs to a project member, else None."""
+    db = SessionLocal()
+    try:
+        user = authenticate_token(token, db)
+        auth = load_auth_context(db, user.id)
+        # project membership outlives leaving the team, the team still has to let the user in
+        allowed = auth.is_project_member(project_id) and auth.is_team_member(auth.project_teams[project_id])
+        return user.id if allowed else None
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+
+
+# pushes ticket events and member availability of one project.
+# browsers can't set headers on a websocket: token comes as ?token= or the access_token cookie
+@router.websocket("/ws/projects/{project_id}")
+async def project_events(
+    websocket: WebSocket,
+    project_id: int,
+    token: Optional[str] = Query(None),
+):
+    token = token or websocket.cookies.get("access_token")
+    user_id = await run_in_threadpool(_authorize, token, project_id) if token else None
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    sub = hub.subscribe(project_id)
+
+    async def pump():
+        while True:
+            message = await sub.queue.get()
+            if message is None:
+                # queue overflowed, client should reconnect and resync with /tickets/changes
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            if message.get("type") == "member_removed" and message.get("user_id") == user_id:
+                # membership is only checked at connect, losing it ends the stream
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
+            await websocket.send_json(message)
+
+    async def drain():
+        # clients only listen, this is how a disconnect is noticed
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(pump()), asyncio.create_task(drain())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        hub.unsubscribe(sub)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
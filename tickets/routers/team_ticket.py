@@ -1,11 +1,23 @@
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional, Union
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Path, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from tickets.database import get_db
+from tickets.database import get_db, get_async_read_db
 from tickets.oauth2 import get_current_user
-from tickets.schemas.ticket import TicketCreate, TicketStatusUpdate, TicketAssigneeUpdate, TicketOut, TicketFeedbackUpdate, TicketPriority
+from tickets.auth_context import AuthContext
+from tickets.routers.dependencies import get_auth_context, get_read_auth_context
+from tickets.schemas.ticket import (
+    TicketCreate, TicketStatusUpdate, TicketAssigneeUpdate, TicketOut, TicketFeedbackUpdate, TicketPriority, TicketFilter,
+    TicketBatchRequest, TicketBatchResult, TicketChanges, TicketListNormalized, TicketCounts,
+)
 from tickets.repository import ticket as ticket_repo
+from tickets.repository import ticket_search
+from tickets.repository import ticket_counts
+from tickets.repository.ticket_event import project_watermark
+from tickets.etag import not_modified
+from tickets.serialization import json_response, parse_fields
 from tickets import models
 from ..enums import *
 
@@ -16,13 +28,12 @@ router = APIRouter(
 )
 
 #helper
-def _ensure_project_member(user, project_id: int):
-    if not any(pu.project_id == project_id for pu in user.project_users):
+def _ensure_project_member(auth: AuthContext, project_id: int):
+    if not auth.is_project_member(project_id):
         raise HTTPException(403, "Not a project member")
 
-def _ensure_project_admin(user, project_id: int):
-    if not any(pu.project_id == project_id and pu.role == ProjectRole.admin
-               for pu in user.project_users):
+def _ensure_project_admin(auth: AuthContext, project_id: int):
+    if not auth.is_project_admin(project_id):
         raise HTTPException(403, "Not a project admin")
 
 
@@ -32,39 +43,119 @@ def create_ticket(
     payload: TicketCreate = Body(...),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
-    _ensure_project_member(current_user, project_id)
-    return ticket_repo.create_ticket(db, payload, current_user.id, project_id, team_id = current_user.teams[0].id)
+    _ensure_project_member(auth, project_id)
+    return ticket_repo.create_ticket(db, payload, current_user.id, project_id, team_id=auth.project_teams[project_id])
 
 
 
-@router.get("/tickets", response_model=List[TicketOut])
-def list_tickets(
-    project_id: int,
+# create / status / reassign / delete many tickets in one transaction, one result per operation
+@router.post("/tickets:batch", response_model=List[TicketBatchResult])
+def batch_tickets(
+    project_id: int = Path(..., ge=1),
+    payload: TicketBatchRequest = Body(...),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
-    _ensure_project_admin(current_user, project_id)
-    return ticket_repo.get_all_tickets(db, project_id)
+    _ensure_project_member(auth, project_id)
+    return ticket_repo.apply_ticket_batch(db, project_id, payload.operations, auth)
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# ?format=normalized: tickets carry creator_id/assignee_id/worker_team_id,
+# every distinct user and worker team is sent once under `included`
+TicketListFormat = Literal["full", "normalized"]
 
+# ?fields=id,title,status: only these TicketOut fields are selected and sent
+FIELDS_DESCRIPTION = f"Comma separated subset of: {', '.join(ticket_repo.TICKET_FIELDS)}"
 
-@router.get("/tickets/my-assigned", response_model=List[TicketOut])
-def my_assigned(
+def _shape(tickets: List[dict], response_format: TicketListFormat):
+    return ticket_repo.normalize_tickets(tickets) if response_format == "normalized" else tickets
+
+# GET routes are async: the sync repository code runs through AsyncSession.run_sync,
+# so a slow query waits on the event loop instead of holding a threadpool thread
+
+# paginated on request: with ?limit= or ?cursor= at most `limit` tickets (default DEFAULT_PAGE_SIZE)
+# come back, and a truncated page carries the X-Next-Cursor header to pass back as ?cursor=.
+# Without either the whole list is sent, as before pagination existed
+@router.get("/tickets", response_model=Union[List[TicketOut], TicketListNormalized])
+async def list_tickets(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    response_format: TicketListFormat = Query("full", alias="format"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=ticket_repo.MAX_PAGE_SIZE),
+    ticket_status: Optional[TicketStatus] = Query(None, alias="status"),
+    priority: Optional[TicketPriority] = Query(None),
+    ticket_type: Optional[TicketType] = Query(None, alias="type"),
+    assigned_to: Optional[int] = Query(None),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    updated_after: Optional[datetime] = Query(None),
+    updated_before: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(get_read_auth_context),
 ):
-    _ensure_project_member(current_user, project_id)
-    return ticket_repo.get_tickets_assigned_to_user(db, current_user, project_id)
+    _ensure_project_admin(auth, project_id)
+    selected = parse_fields(fields, ticket_repo.TICKET_FIELDS)
+    # 304 before any ticket is loaded; the query string covers filters, fields and cursor
+    watermark = await db.run_sync(project_watermark, project_id)
+    if cached := not_modified(request, response, "tickets", project_id, watermark, request.url.query):
+        return cached
+    filters = TicketFilter(
+        status=ticket_status,
+        priority=priority,
+        type=ticket_type,
+        assigned_to=assigned_to,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+    if limit is None and cursor is not None:
+        limit = ticket_repo.DEFAULT_PAGE_SIZE
+    tickets, next_cursor = await db.run_sync(ticket_repo.get_tickets_page, project_id, filters, cursor, limit, selected)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return json_response(_shape(tickets, response_format), response)
 
-@router.get("/tickets/my-created", response_model=List[TicketOut])
-def my_created(
+
+@router.get("/tickets/my-assigned", response_model=Union[List[TicketOut], TicketListNormalized])
+async def my_assigned(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    response_format: TicketListFormat = Query("full", alias="format"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(get_read_auth_context),
 ):
-    _ensure_project_member(current_user, project_id)
-    return ticket_repo.get_tickets_assigned_to_user(db, current_user, project_id)
+    _ensure_project_member(auth, project_id)
+    selected = parse_fields(fields, ticket_repo.TICKET_FIELDS)
+    watermark = await db.run_sync(project_watermark, project_id)
+    if cached := not_modified(
+        request, response, "my-assigned", project_id, auth.user_id, watermark, response_format, selected
+    ):
+        return cached
+    tickets = await db.run_sync(ticket_repo.get_tickets_assigned_to_user, auth, project_id, selected)
+    return json_response(_shape(tickets, response_format), response)
+
+@router.get("/tickets/my-created", response_model=Union[List[TicketOut], TicketListNormalized])
+async def my_created(
+    project_id: int,
+    response_format: TicketListFormat = Query("full", alias="format"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(get_read_auth_context),
+):
+    _ensure_project_member(auth, project_id)
+    selected = parse_fields(fields, ticket_repo.TICKET_FIELDS)
+    tickets = await db.run_sync(ticket_repo.get_tickets_assigned_to_user, auth, project_id, selected)
+    return json_response(_shape(tickets, response_format))
 
 
 
@@ -74,15 +165,53 @@ def get_priorities(
 ):
     return [p.value for p in TicketPriority]
 
+# ranked full-text search over title and description, every word must match
+@router.get("/tickets/search", response_model=List[TicketOut])
+async def search_tickets(
+    project_id: int,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(get_read_auth_context),
+):
+    _ensure_project_member(auth, project_id)
+    return await db.run_sync(ticket_search.search_tickets, project_id, q, limit)
+
+# open / in progress / closed for the project and each assignee, no COUNT over tickets
+@router.get("/tickets/counts", response_model=TicketCounts)
+async def ticket_counts_by_status(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(get_read_auth_context),
+):
+    _ensure_project_member(auth, project_id)
+    users = await db.run_sync(ticket_counts.user_counts_in_project, project_id)
+    return TicketCounts(
+        project=await db.run_sync(ticket_counts.project_counts, project_id),
+        users=[{"user_id": user_id, **counts} for user_id, counts in users.items()],
+    )
+
+# delta sync: call without `since` once, then keep passing back the returned cursor
+@router.get("/tickets/changes", response_model=TicketChanges)
+async def ticket_changes(
+    project_id: int,
+    since: Optional[str] = Query(None),
+    limit: int = Query(ticket_repo.SYNC_PAGE_SIZE, ge=1, le=ticket_repo.MAX_SYNC_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(get_read_auth_context),
+):
+    _ensure_project_admin(auth, project_id)
+    return await db.run_sync(ticket_repo.get_ticket_changes, project_id, since, limit)
+
 @router.get("/tickets/{ticket_id}", response_model=TicketOut)
-def get_ticket(
+async def get_ticket(
     project_id: int,
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    auth: AuthContext = Depends(get_read_auth_context),
 ):
-    _ensure_project_member(current_user, project_id)
-    return ticket_repo.get_ticket_by_id(db, ticket_id, project_id)
+    _ensure_project_member(auth, project_id)
+    return await db.run_sync(ticket_repo.get_ticket_by_id, ticket_id, project_id)
 
 @router.put("/tickets/{ticket_id}/status", response_model=TicketOut)
 def update_ticket_status_by_assignee(
@@ -112,9 +241,10 @@ def update_ticket_assignee(
     payload: TicketAssigneeUpdate = Body(...),  # содержит только `assigned_to`
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
-    _ensure_project_admin(current_user, project_id)
-    return ticket_repo.update_ticket_assignee(db, ticket_id, payload, project_id)
+    _ensure_project_admin(auth, project_id)
+    return ticket_repo.update_ticket_assignee(db, ticket_id, payload, project_id, actor_id=current_user.id)
 
 
 @router.delete("/tickets/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -123,7 +253,8 @@ def delete_ticket(
     ticket_id: int,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
-    _ensure_project_member(current_user, project_id)
-    ticket_repo.delete_ticket(db, ticket_id, project_id, current_user)
+    _ensure_project_member(auth, project_id)
+    ticket_repo.delete_ticket(db, ticket_id, project_id, auth)
     return
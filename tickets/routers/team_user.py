@@ -1,24 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, status, Response, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
 from tickets.schemas import user as user_schema
 from tickets.schemas import team as team_schema
-from tickets.database import get_db
+from tickets.database import get_db, get_async_read_db
 from tickets.repository import user as user_repository
-from tickets.oauth2 import get_current_user
+from tickets.repository import project as project_repository
+from tickets.oauth2 import get_current_user, get_current_read_user, principal_cache
 from tickets import models
-from tickets.routers.dependencies import require_team_member
+from tickets import realtime
+from tickets.routers.dependencies import get_auth_context, require_team_member_read
+from tickets.auth_context import AuthContext
 from ..enums import TeamRole
 
 router = APIRouter(prefix="/teams/{team_id}", tags=["Team Members"])
 
-def _ensure_member(user: models.User, team_id: int):
-    if not any(t.id == team_id for t in user.teams):
-        raise HTTPException(status_code=403, detail="Team not available.")
-
-def _ensure_team_admin(user: models.User, team_id: int):
-    if not any(ut.team_id == team_id and ut.role is TeamRole.admin for ut in user.user_teams):
+def _ensure_team_admin(auth: AuthContext, team_id: int):
+    if not auth.is_team_admin(team_id):
         raise HTTPException(status_code=403, detail="Requires team admin role.")
 
 #----------------------- GET logics
@@ -26,66 +26,69 @@ def _ensure_team_admin(user: models.User, team_id: int):
     "/users",
     response_model=List[user_schema.UserBrief],
 )
-def list_team_user_names(
+async def list_team_user_names(
     team_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_team_member),
+    db: AsyncSession = Depends(get_async_read_db),
+    _auth: AuthContext = Depends(require_team_member_read),
 ):
-    _ensure_member(current_user, team_id)
-    return user_repository.get_team_user_briefs(db, team_id)
+    return await db.run_sync(user_repository.get_team_user_briefs, team_id)
 
 @router.get(
     "/available-admins",
     response_model=List[user_schema.UserBrief],
 )
-def available_admins(
+async def available_admins(
     team_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_team_member),
+    db: AsyncSession = Depends(get_async_read_db),
+    _auth: AuthContext = Depends(require_team_member_read),
 ):
-    _ensure_member(current_user, team_id)
-    return user_repository.get_available_admin_briefs(db, team_id)
+    return await db.run_sync(user_repository.get_available_admin_briefs, team_id)
 
 @router.get(
     "/available-users",
     response_model=List[user_schema.UserBrief],
 )
-def available_members(
+async def available_members(
     team_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(require_team_member),
+    db: AsyncSession = Depends(get_async_read_db),
+    _auth: AuthContext = Depends(require_team_member_read),
 ):
-    _ensure_member(current_user, team_id)
-    users = user_repository.get_available_users_by_role(
-        db,
+    users = await db.run_sync(
+        user_repository.get_available_users_by_role,
         role=TeamRole.member.value,
         team_id=team_id
     )
     return [user_schema.UserBrief.model_validate(u) for u in users]
 @router.get("/teams", response_model=List[team_schema.TeamOut])
-def list_my_teams(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    return current_user.teams
+async def list_my_teams(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_read_user),
+):
+    # lazy relationship, loaded and validated inside the session's sync context
+    return await db.run_sync(lambda _: [team_schema.TeamOut.model_validate(t) for t in current_user.teams])
 @router.get(
     "/users/{user_id}",
     response_model=user_schema.UserInTeamWithProjects
 )
-def read_user_in_team(
+async def read_user_in_team(
     team_id: int    = Path(..., ge=1),
     user_id: int    = Path(..., ge=1),
-    db: Session     = Depends(get_db),
-    _: None         = Depends(require_team_member),  # current_user в этой команде
+    db: AsyncSession = Depends(get_async_read_db),
+    _: AuthContext  = Depends(require_team_member_read),  # current_user в этой команде
 ):
-    assoc       = user_repository.get_user_with_projects_in_team(db, team_id, user_id)
-    proj_assocs = user_repository.get_project_memberships_for_user_in_team(db, team_id, user_id)
-    #pydantic take UserBrief,
-    #assoc.role/joined_at
-    #from list proj_assocs in ProjectMembership.
-    return {
-        "user":      assoc.user,
-        "role":      assoc.role,
-        "joined_at": assoc.joined_at,
-        "projects":  proj_assocs
-    }
+    def load(session: Session) -> user_schema.UserInTeamWithProjects:
+        assoc       = user_repository.get_user_with_projects_in_team(session, team_id, user_id)
+        proj_assocs = user_repository.get_project_memberships_for_user_in_team(session, team_id, user_id)
+        #pydantic take UserBrief,
+        #assoc.role/joined_at
+        #from list proj_assocs in ProjectMembership.
+        return user_schema.UserInTeamWithProjects.model_validate({
+            "user":      assoc.user,
+            "role":      assoc.role,
+            "joined_at": assoc.joined_at,
+            "projects":  proj_assocs
+        }, from_attributes=True)
+    return await db.run_sync(load)
 
 #---- Update Logics
 @router.put("/availability", response_model=user_schema.UserAvailabilityOut)
@@ -93,9 +96,13 @@ def update_my_availability(
     is_available: bool,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     current_user.is_available = is_available
+    message = {"type": "availability", "user_id": current_user.id, "is_available": is_available}
+    realtime.queue_messages(db, [(project_id, message) for project_id in auth.projects])
     db.commit()
+    principal_cache.invalidate_user(current_user.id)
     db.refresh(current_user)
     return current_user
 
@@ -110,8 +117,9 @@ def add_user_to_team(
     role: TeamRole = Query(TeamRole.member),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
-    _ensure_team_admin(current_user, team_id)
+    _ensure_team_admin(auth, team_id)
     exists = (db.query(models.UserTeam).filter_by(user_id=user_id, team_id=team_id).first())
     if exists:
         raise HTTPException(status_code=400, detail="User already in team")
@@ -123,6 +131,7 @@ def add_user_to_team(
     )
     db.add(association)
     db.commit()
+    principal_cache.invalidate_user(user_id)
     db.refresh(association)
     return association
 
@@ -135,8 +144,9 @@ def remove_user_from_team(
     team_id: int = Path(..., ge=1),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    auth: AuthContext = Depends(get_auth_context),
 ):
-    _ensure_team_admin(current_user, team_id)
+    _ensure_team_admin(auth, team_id)
     deleted = (
         db.query(models.UserTeam)
           .filter_by(user_id=user_id, team_id=team_id)
@@ -144,5 +154,7 @@ def remove_user_from_team(
     )
     if not deleted:
         raise HTTPException(status_code=404, detail="User not in this team")
+    project_repository.queue_member_removed(db, user_id, project_repository.team_project_ids(db, team_id, user_id))
     db.commit()
+    principal_cache.invalidate_user(user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
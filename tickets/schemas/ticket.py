@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic import ConfigDict
-from typing import Optional
+from typing import List, Literal, Optional, Union
+from typing_extensions import Annotated
 from datetime import datetime
 from tickets.schemas import user
 from tickets.schemas.worker_team import WorkerTeamBrief
@@ -21,10 +22,14 @@ class TicketCreate(TicketBase):
     assigned_to: int | None = None
     worker_team_id: Optional[int] = None
     priority: Optional[TicketPriority] = TicketPriority.medium
+    # no assigned_to_name: give it to the least loaded available project member
+    auto_assign: bool = False
     model_config = ConfigDict(from_attributes=True)
 
 class TicketStatusUpdate(BaseModel):
     status: TicketStatus
+    # optional optimistic lock: 409 if the ticket changed since the client read it
+    expected_version: Optional[int] = None
 
 class TicketFeedbackUpdate(BaseModel):
     feedback: Optional[str] = None
@@ -32,6 +37,17 @@ class TicketFeedbackUpdate(BaseModel):
 
 class TicketAssigneeUpdate(BaseModel):
     assigned_to: int
+
+#server-side filters of the ticket list, every field is optional
+class TicketFilter(BaseModel):
+    status: Optional[TicketStatus] = None
+    priority: Optional[TicketPriority] = None
+    type: Optional[TicketType] = None
+    assigned_to: Optional[int] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
 #we can create tickets only in projects, so i removed team_id
 class TicketOut(TicketBase):
     id: int
@@ -44,4 +60,84 @@ class TicketOut(TicketBase):
     priority: TicketPriority
     confirmed: bool
     feedback: Optional[str]
+    version: int = 1
     model_config = ConfigDict(from_attributes=True)
+
+#---------------- ?format=normalized: related objects by id, each sent once in `included`
+class TicketNormalized(TicketBase):
+    id: int
+    type: TicketType
+    status: TicketStatus
+    creator_id: int
+    assignee_id: Optional[int] = None
+    worker_team_id: Optional[int] = None
+    created_at: datetime
+    priority: TicketPriority
+    confirmed: bool
+    feedback: Optional[str]
+    version: int = 1
+
+class TicketIncluded(BaseModel):
+    users: List[user.UserBrief]
+    worker_teams: List[WorkerTeamBrief]
+
+class TicketListNormalized(BaseModel):
+    tickets: List[TicketNormalized]
+    included: TicketIncluded
+
+#---------------- batch operations, applied in one transaction
+class TicketBatchCreate(TicketCreate):
+    op: Literal["create"]
+    # loads only move on commit, so every create in a batch would pick the same person
+    auto_assign: Literal[False] = False
+
+class TicketBatchStatus(BaseModel):
+    op: Literal["status"]
+    ticket_id: int
+    status: TicketStatus
+
+class TicketBatchReassign(BaseModel):
+    op: Literal["reassign"]
+    ticket_id: int
+    assigned_to: int
+
+class TicketBatchDelete(BaseModel):
+    op: Literal["delete"]
+    ticket_id: int
+
+TicketBatchOperation = Annotated[
+    Union[TicketBatchCreate, TicketBatchStatus, TicketBatchReassign, TicketBatchDelete],
+    Field(discriminator="op"),
+]
+
+class TicketBatchRequest(BaseModel):
+    operations: List[TicketBatchOperation] = Field(..., min_length=1, max_length=500)
+
+class TicketBatchResult(BaseModel):
+    index: int
+    op: str
+    ok: bool
+    status_code: int
+    ticket_id: Optional[int] = None
+    detail: Optional[str] = None
+
+#---------------- counters, read from the denormalized count tables
+class TicketStatusCounts(BaseModel):
+    open: int = 0
+    in_progress: int = 0
+    closed: int = 0
+
+class UserTicketCounts(TicketStatusCounts):
+    user_id: int
+
+class TicketCounts(BaseModel):
+    project: TicketStatusCounts
+    users: List[UserTicketCounts]  # assignees only, by user id
+
+#---------------- delta sync
+class TicketChanges(BaseModel):
+    cursor: str                      # pass back as ?since= next time
+    tickets: List[TicketOut]         # created or updated, current state
+    deleted: List[int]               # ids to drop on the client
+    has_more: bool                   # more changes waiting, call again right away
+    snapshot: bool = False           # a page of the full list: the call without since resets local state
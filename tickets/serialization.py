@@ -0,0 +1,50 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional, Sequence
+from fastapi import HTTPException, Response
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is the fallback
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Already-shaped dicts straight to bytes, skipping response_model validation.
+    Headers set on the route's injected `response` (ETag, cursors) are carried over.
+    """
+    out = Response(dumps(content), status_code=status_code, media_type="application/json")
+    if response is not None:
+        for key, value in response.headers.items():
+            out.headers[key] = value
+    return out
+
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str]) -> Optional[tuple[str, ...]]:
+    """
+    ?fields=a,b,c -> the requested fields in `allowed` order, id always included.
+    None when the parameter is absent (every field).
+    """
+    if raw is None:
+        return None
+    requested = {f.strip() for f in raw.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(f for f in allowed if f in requested or f == "id")